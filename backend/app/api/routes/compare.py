@@ -3,8 +3,8 @@
 from collections import defaultdict
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -12,14 +12,60 @@ from app.api.schemas import (
     CompareRequest, CompareResponse, DetectionListItem,
     SideBySideRequest, SideBySideResponse
 )
-from app.models.detection import Detection
+from app.services.cache import TTLCache
 from app.services.search import SearchService
 from app.services.mitre import mitre_service
 
 router = APIRouter(prefix="/compare", tags=["compare"])
 
+VALID_SOURCES = frozenset({
+    "sigma", "elastic", "splunk", "sublime", "elastic_protections",
+    "lolrmm", "elastic_hunting", "sentinel",
+})
+
+# Tactic order for the coverage matrix (kill chain order)
+TACTIC_ORDER = (
+    "TA0043",  # Reconnaissance
+    "TA0042",  # Resource Development
+    "TA0001",  # Initial Access
+    "TA0002",  # Execution
+    "TA0003",  # Persistence
+    "TA0004",  # Privilege Escalation
+    "TA0005",  # Defense Evasion
+    "TA0006",  # Credential Access
+    "TA0007",  # Discovery
+    "TA0008",  # Lateral Movement
+    "TA0009",  # Collection
+    "TA0011",  # Command and Control
+    "TA0010",  # Exfiltration
+    "TA0040",  # Impact
+)
+
+# Fields compared in the side-by-side view, in display order
+SIDE_BY_SIDE_FIELDS = (
+    "title",
+    "source",
+    "severity",
+    "status",
+    "language",
+    "platform",
+    "event_category",
+    "data_source_normalized",
+    "mitre_tactics",
+    "mitre_techniques",
+    "log_sources",
+    "description",
+    "detection_logic",
+)
+
+# Compare responses keyed by (technique, keyword, platform, sources)
+_compare_cache = TTLCache(ttl=60)
+
+# Encoded coverage matrix JSON; data only changes on ingestion, which invalidates this cache
+_coverage_matrix_cache = TTLCache(ttl=60)
 
-@router.get("")
+
+@router.get("", response_model=CompareResponse)
 async def compare_detections(
     technique: Optional[str] = Query(None, description="MITRE technique ID (e.g., T1059)"),
     keyword: Optional[str] = Query(None, description="Keyword to search in detection logic"),
@@ -37,42 +83,11 @@ async def compare_detections(
             detail="One of 'technique', 'keyword', or 'platform' parameter is required",
         )
 
-    search_service = SearchService(db)
     source_list = [s.strip() for s in sources.split(",")] if sources else None
+    return await _run_compare(db, technique, keyword, platform, source_list)
 
-    if technique:
-        # Compare by MITRE technique
-        grouped = await search_service.compare_by_technique(technique, source_list)
-        query_type = "technique"
-        query_value = technique
-    elif platform:
-        # Compare by platform
-        grouped = await search_service.compare_by_platform(platform, source_list)
-        query_type = "platform"
-        query_value = platform
-    else:
-        # Compare by keyword
-        grouped = await search_service.compare_by_keyword(keyword, source_list)
-        query_type = "keyword"
-        query_value = keyword
 
-    # Convert to response format
-    results = {}
-    total_by_source = {}
-
-    for source, detections in grouped.items():
-        results[source] = [DetectionListItem.from_detection(d) for d in detections]
-        total_by_source[source] = len(detections)
-
-    return CompareResponse(
-        query_type=query_type,
-        query_value=query_value,
-        results=results,
-        total_by_source=total_by_source,
-    )
-
-
-@router.post("")
+@router.post("", response_model=CompareResponse)
 async def compare_detections_post(
     request: CompareRequest,
     db: AsyncSession = Depends(get_db),
@@ -84,22 +99,54 @@ async def compare_detections_post(
             detail="One of 'technique', 'keyword', or 'platform' is required",
         )
 
-    search_service = SearchService(db)
     source_list = request.sources if request.sources else None
+    return await _run_compare(
+        db, request.technique, request.keyword, request.platform, source_list
+    )
+
+
+async def _run_compare(
+    db: AsyncSession,
+    technique: Optional[str],
+    keyword: Optional[str],
+    platform: Optional[str],
+    sources: Optional[list[str]],
+) -> CompareResponse:
+    """Run a comparison query, sharing cached results between GET and POST."""
+    key = (technique, keyword, platform, tuple(sorted(sources)) if sources else None)
+    return await _compare_cache.get_or_set(
+        key,
+        lambda: _build_compare_response(db, technique, keyword, platform, sources),
+    )
+
 
-    if request.technique:
-        grouped = await search_service.compare_by_technique(request.technique, source_list)
+async def _build_compare_response(
+    db: AsyncSession,
+    technique: Optional[str],
+    keyword: Optional[str],
+    platform: Optional[str],
+    sources: Optional[list[str]],
+) -> CompareResponse:
+    """Query detections for a comparison and group them by source."""
+    search_service = SearchService(db)
+
+    if technique:
+        # Compare by MITRE technique
+        grouped = await search_service.compare_by_technique(technique, sources)
         query_type = "technique"
-        query_value = request.technique
-    elif request.platform:
-        grouped = await search_service.compare_by_platform(request.platform, source_list)
+        query_value = technique
+    elif platform:
+        # Compare by platform
+        grouped = await search_service.compare_by_platform(platform, sources)
         query_type = "platform"
-        query_value = request.platform
+        query_value = platform
     else:
-        grouped = await search_service.compare_by_keyword(request.keyword, source_list)
+        # Compare by keyword
+        grouped = await search_service.compare_by_keyword(keyword, sources)
         query_type = "keyword"
-        query_value = request.keyword
+        query_value = keyword
 
+    # Convert to response format
     results = {}
     total_by_source = {}
 
@@ -126,52 +173,30 @@ async def find_coverage_gaps(
     Returns techniques that base_source has detections for,
     but compare_source does not.
     """
-    valid_sources = ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm", "elastic_hunting", "sentinel"]
-    if base_source not in valid_sources:
+    if base_source not in VALID_SOURCES:
         raise HTTPException(status_code=400, detail=f"Invalid base_source: {base_source}")
-    if compare_source not in valid_sources:
+    if compare_source not in VALID_SOURCES:
         raise HTTPException(status_code=400, detail=f"Invalid compare_source: {compare_source}")
 
-    search_service = SearchService(db)
-
-    # Get all techniques from each source
-    from app.services.search import SearchFilters
-    from sqlalchemy import select
-    from app.models.detection import Detection
+    # Membership of every technique in either source, computed in the database
+    rows = await SearchService(db).diff_techniques(base_source, compare_source)
 
-    # Get unique techniques from base source
-    base_filters = SearchFilters(sources=[base_source], limit=10000)
-    base_detections, _ = await search_service.search_detections(base_filters)
-
-    base_techniques = set()
-    for d in base_detections:
-        base_techniques.update(d.mitre_techniques)
-
-    # Get unique techniques from compare source
-    compare_filters = SearchFilters(sources=[compare_source], limit=10000)
-    compare_detections, _ = await search_service.search_detections(compare_filters)
-
-    compare_techniques = set()
-    for d in compare_detections:
-        compare_techniques.update(d.mitre_techniques)
-
-    # Find gaps
-    gaps = base_techniques - compare_techniques
-    overlaps = base_techniques & compare_techniques
-    unique_to_compare = compare_techniques - base_techniques
+    gaps = [tech_id for tech_id, in_base, in_compare in rows if not in_compare]
+    unique_to_compare = [tech_id for tech_id, in_base, in_compare in rows if not in_base]
+    overlap_count = len(rows) - len(gaps) - len(unique_to_compare)
 
     return {
         "base_source": base_source,
         "compare_source": compare_source,
-        "base_technique_count": len(base_techniques),
-        "compare_technique_count": len(compare_techniques),
-        "overlap_count": len(overlaps),
-        "gaps": sorted(list(gaps)),  # In base but not compare
-        "unique_to_compare": sorted(list(unique_to_compare)),  # In compare but not base
+        "base_technique_count": len(rows) - len(unique_to_compare),
+        "compare_technique_count": len(rows) - len(gaps),
+        "overlap_count": overlap_count,
+        "gaps": gaps,  # In base but not compare
+        "unique_to_compare": unique_to_compare,  # In compare but not base
     }
 
 
-@router.post("/side-by-side")
+@router.post("/side-by-side", response_model=SideBySideResponse)
 async def compare_side_by_side(
     request: SideBySideRequest,
     db: AsyncSession = Depends(get_db),
@@ -187,7 +212,7 @@ async def compare_side_by_side(
         )
 
     search_service = SearchService(db)
-    detections = await search_service.get_detections_by_ids(request.ids)
+    detections = await search_service.get_detections_for_side_by_side(request.ids)
 
     if len(detections) < 2:
         raise HTTPException(
@@ -195,21 +220,29 @@ async def compare_side_by_side(
             detail="At least 2 of the provided detection IDs must exist",
         )
 
-    # Build field comparison
+    # Build field comparison in a single pass: one row per detection,
+    # transposed into one column per field
+    rows = [
+        (
+            d.title,
+            d.source,
+            d.severity,
+            d.status,
+            d.language,
+            d.platform,
+            d.event_category,
+            d.data_source_normalized,
+            ", ".join(d.mitre_tactics),
+            ", ".join(d.mitre_techniques),
+            ", ".join(d.log_sources),
+            d.description or "",
+            d.detection_logic,
+        )
+        for d in detections
+    ]
     field_comparison = {
-        "title": [d.title for d in detections],
-        "source": [d.source for d in detections],
-        "severity": [d.severity for d in detections],
-        "status": [d.status for d in detections],
-        "language": [d.language for d in detections],
-        "platform": [d.platform for d in detections],
-        "event_category": [d.event_category for d in detections],
-        "data_source_normalized": [d.data_source_normalized for d in detections],
-        "mitre_tactics": [", ".join(d.mitre_tactics) if d.mitre_tactics else "" for d in detections],
-        "mitre_techniques": [", ".join(d.mitre_techniques) if d.mitre_techniques else "" for d in detections],
-        "log_sources": [", ".join(d.log_sources) if d.log_sources else "" for d in detections],
-        "description": [d.description or "" for d in detections],
-        "detection_logic": [d.detection_logic or "" for d in detections],
+        field: list(values)
+        for field, values in zip(SIDE_BY_SIDE_FIELDS, zip(*rows))
     }
 
     return SideBySideResponse(
@@ -229,72 +262,89 @@ async def get_coverage_matrix(
     Returns coverage data showing which sources have detections for each technique,
     organized by tactic for matrix visualization.
     """
+    if tactic:
+        tactic = tactic.upper()
+
+    body = await _coverage_matrix_cache.get_or_set(
+        (tactic, include_subtechniques),
+        lambda: _render_coverage_matrix(db, tactic, include_subtechniques),
+    )
+    return Response(content=body, media_type="application/json")
+
+
+async def _render_coverage_matrix(
+    db: AsyncSession,
+    tactic: Optional[str],
+    include_subtechniques: bool,
+) -> bytes:
+    """Build the coverage matrix and serialize it once with orjson.
+
+    The matrix is a large untyped dict, so it is cached as encoded JSON and
+    repeat requests skip both aggregation and serialization.
+    """
+    return orjson.dumps(await _build_coverage_matrix(db, tactic, include_subtechniques))
+
+
+async def _build_coverage_matrix(
+    db: AsyncSession,
+    tactic: Optional[str],
+    include_subtechniques: bool,
+) -> dict:
+    """Aggregate detection counts into the coverage matrix payload."""
     await mitre_service.ensure_loaded()
 
-    # Get all detections with their techniques
-    query = select(Detection.source, Detection.mitre_techniques)
-    result = await db.execute(query)
-    rows = result.all()
+    # Count detections per (source, technique) pair in the database
+    search_service = SearchService(db)
+    rows = await search_service.count_techniques_by_source()
 
     # Build coverage map: technique_id -> {source: count}
     coverage: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
     sources_set: set[str] = set()
     unmapped_techniques: set[str] = set()
+    mapped_ids: dict[str, Optional[str]] = {}
 
-    for source, techniques in rows:
-        if not techniques:
+    for source, tech_id, count in rows:
+        if not tech_id:
             continue
         sources_set.add(source)
-        for tech_id in techniques:
-            if not tech_id:
-                continue
-
-            # Map deprecated/revoked techniques to current equivalents
-            mapped_id = mitre_service.map_technique(tech_id)
-            if mapped_id:
-                coverage[mapped_id][source] += 1
-                # Also roll up sub-technique counts to parent technique
-                if "." in mapped_id:
-                    parent_id = mapped_id.split(".")[0]
-                    coverage[parent_id][source] += 1
-            else:
-                # Track unmapped techniques for debugging
-                unmapped_techniques.add(tech_id)
+
+        # Map deprecated/revoked techniques to current equivalents
+        # (resolved once per distinct technique ID)
+        if tech_id not in mapped_ids:
+            mapped_ids[tech_id] = mitre_service.map_technique(tech_id)
+        mapped_id = mapped_ids[tech_id]
+
+        if mapped_id:
+            coverage[mapped_id][source] += count
+        else:
+            # Track unmapped techniques for debugging
+            unmapped_techniques.add(tech_id)
+
+    # Roll up sub-technique counts to their parent technique in one pass
+    for tech_id, source_counts in list(coverage.items()):
+        if "." not in tech_id:
+            continue
+        parent_counts = coverage[tech_id.partition(".")[0]]
+        for source, count in source_counts.items():
+            parent_counts[source] += count
 
     sources = sorted(sources_set)
+    tech_totals = {tech_id: sum(counts.values()) for tech_id, counts in coverage.items()}
 
     # Get MITRE tactics and techniques
     all_tactics = mitre_service.get_all_tactics()
-    all_techniques = mitre_service.get_all_techniques()
 
     # Filter techniques by tactic if specified
     if tactic:
-        tactic = tactic.upper()
         if tactic not in all_tactics:
             raise HTTPException(status_code=400, detail=f"Invalid tactic ID: {tactic}")
 
     # Organize by tactic
     tactics_data = []
+    src_tuple = tuple(sources)
+    coverage_get = coverage.get
 
-    # Define tactic order (kill chain order)
-    tactic_order = [
-        "TA0043",  # Reconnaissance
-        "TA0042",  # Resource Development
-        "TA0001",  # Initial Access
-        "TA0002",  # Execution
-        "TA0003",  # Persistence
-        "TA0004",  # Privilege Escalation
-        "TA0005",  # Defense Evasion
-        "TA0006",  # Credential Access
-        "TA0007",  # Discovery
-        "TA0008",  # Lateral Movement
-        "TA0009",  # Collection
-        "TA0011",  # Command and Control
-        "TA0010",  # Exfiltration
-        "TA0040",  # Impact
-    ]
-
-    for tactic_id in tactic_order:
+    for tactic_id in TACTIC_ORDER:
         if tactic and tactic_id != tactic:
             continue
 
@@ -302,33 +352,24 @@ async def get_coverage_matrix(
         if not tactic_info or tactic_info.get("deprecated"):
             continue
 
-        # Get techniques for this tactic
+        # Get active techniques for this tactic (parents first, then subtechniques)
         tactic_techniques = []
-        for tech_id, tech_info in all_techniques.items():
-            # Skip deprecated or revoked techniques
-            if tech_info.get("deprecated") or tech_info.get("revoked"):
-                continue
-            if tactic_id not in tech_info.get("tactics", []):
-                continue
-            if not include_subtechniques and tech_info.get("is_subtechnique"):
-                continue
-
+        for tech_id, tech_info in mitre_service.get_techniques_for_tactic(
+            tactic_id, include_subtechniques
+        ):
             # Get coverage for this technique
-            tech_coverage = coverage.get(tech_id, {})
-            total_count = sum(tech_coverage.values())
+            tech_coverage_get = coverage_get(tech_id, {}).get
+            counts = {src: tech_coverage_get(src, 0) for src in src_tuple}
 
             tactic_techniques.append({
                 "id": tech_id,
                 "name": tech_info.get("name", ""),
                 "is_subtechnique": tech_info.get("is_subtechnique", False),
-                "coverage": {src: tech_coverage.get(src, 0) for src in sources},
-                "total_detections": total_count,
-                "sources_with_coverage": len([s for s in sources if tech_coverage.get(s, 0) > 0]),
+                "coverage": counts,
+                "total_detections": tech_totals.get(tech_id, 0),
+                "sources_with_coverage": sum(1 for v in counts.values() if v),
             })
 
-        # Sort techniques: parent techniques first, then subtechniques
-        tactic_techniques.sort(key=lambda t: (t["is_subtechnique"], t["id"]))
-
         if tactic_techniques:  # Only include tactics with techniques
             tactics_data.append({
                 "id": tactic_id,
@@ -340,12 +381,12 @@ async def get_coverage_matrix(
 
     # Calculate summary statistics
     total_techniques = sum(t["technique_count"] for t in tactics_data)
-    techniques_with_coverage = len([t for t in coverage.keys() if sum(coverage[t].values()) > 0])
+    techniques_with_coverage = sum(1 for total in tech_totals.values() if total > 0)
 
     # Coverage by source
     source_coverage = {}
     for src in sources:
-        covered = len([t for t in coverage.keys() if coverage[t].get(src, 0) > 0])
+        covered = sum(1 for counts in coverage.values() if counts.get(src, 0) > 0)
         source_coverage[src] = {
             "covered_techniques": covered,
             "total_techniques": total_techniques,
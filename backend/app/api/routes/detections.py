@@ -14,12 +14,16 @@ from app.api.schemas import (
     SearchParams,
     StatisticsResponse,
 )
+from app.services.cache import TTLCache
 from app.services.search import SearchService, SearchFilters
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/detections", tags=["detections"])
 
+# Filter dropdown values; they only change on ingestion, which invalidates this
+_filter_options_cache = TTLCache(ttl=60)
+
 
 @router.get("", response_model=DetectionListResponse)
 async def list_detections(
@@ -92,24 +96,8 @@ async def search_detections(
     db: AsyncSession = Depends(get_db),
 ):
     """Search detections with complex filters (POST method for complex queries)."""
-    filters = SearchFilters(
-        search=params.search,
-        sources=params.sources,
-        statuses=params.statuses,
-        severities=params.severities,
-        languages=params.languages,
-        mitre_tactics=params.mitre_tactics,
-        mitre_techniques=params.mitre_techniques,
-        tags=params.tags,
-        log_sources=params.log_sources,
-        platforms=params.platforms,
-        event_categories=params.event_categories,
-        data_sources_normalized=params.data_sources_normalized,
-        offset=params.offset,
-        limit=params.limit,
-        sort_by=params.sort_by,
-        sort_order=params.sort_order,
-    )
+    # SearchParams mirrors SearchFilters field for field
+    filters = SearchFilters(**params.model_dump())
 
     search_service = SearchService(db)
     detections, total = await search_service.search_detections(filters)
@@ -130,17 +118,12 @@ async def get_statistics(db: AsyncSession = Depends(get_db)):
     return StatisticsResponse(**stats)
 
 
-@router.get("/filters")
+@router.get("/filters", response_model=dict[str, list[str]])
 async def get_filter_options(db: AsyncSession = Depends(get_db)):
     """Get available filter options for dropdowns."""
-    search_service = SearchService(db)
-
-    return {
-        "sources": await search_service.get_unique_values("source"),
-        "statuses": await search_service.get_unique_values("status"),
-        "severities": await search_service.get_unique_values("severity"),
-        "languages": await search_service.get_unique_values("language"),
-    }
+    return await _filter_options_cache.get_or_set(
+        "filters", lambda: SearchService(db).get_filter_options()
+    )
 
 
 @router.get("/{detection_id}", response_model=DetectionResponse)
@@ -159,4 +142,5 @@ def _parse_csv(value: Optional[str]) -> list[str]:
     """Parse a comma-separated string into a list."""
     if not value:
         return []
-    return [v.strip() for v in value.split(",") if v.strip()]
+    # Strip each item once rather than once for the test and once for the value
+    return [v for v in map(str.strip, value.split(",")) if v]
@@ -1,26 +1,68 @@
 """Export API routes."""
 
+import asyncio
 import csv
 import io
-import json
-from typing import Optional
+import re
+import zlib
+from operator import attrgetter
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
-from app.api.schemas import ExportRequest, SearchParams
+from app.database import get_session_maker
+from app.api.schemas import ExportRequest
+from app.services.cache import SharedStream
 from app.services.search import SearchService, SearchFilters
 from app.models.detection import Detection
 
 router = APIRouter(prefix="/export", tags=["export"])
 
+# Level 1 keeps compression nearly free on CPU while still shrinking the
+# highly repetitive export payloads several times over
+GZIP_LEVEL = 1
+
+# Rows serialized per worker-thread hop; large enough to amortize the hop,
+# small enough to keep the response streaming
+EXPORT_BATCH_SIZE = 500
+
+# Detection columns included in every export, in output order
+EXPORT_FIELDS = (
+    "id",
+    "source",
+    "source_file",
+    "source_repo_url",
+    "title",
+    "description",
+    "author",
+    "status",
+    "severity",
+    "log_sources",
+    "data_sources",
+    "mitre_tactics",
+    "mitre_techniques",
+    "detection_logic",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+EXPORT_FIELDS_WITH_RAW = EXPORT_FIELDS + ("raw_content",)
+
+# Exports currently being produced, keyed by everything that shapes the output
+_inflight_exports: dict[tuple, SharedStream] = {}
+
+# Characters that force csv.writer to quote a field (QUOTE_MINIMAL)
+_needs_csv_quoting = re.compile(r'[",\r\n]').search
+
 
 @router.post("")
 async def export_detections(
     request: ExportRequest,
-    db: AsyncSession = Depends(get_db),
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),
+    accept_encoding: Optional[str] = Header(None),
 ):
     """Export detections in JSON or CSV format.
 
@@ -28,152 +70,233 @@ async def export_detections(
     - Specific IDs (if provided)
     - Filtered results (if filters provided)
     - All detections (if neither provided)
-    """
-    search_service = SearchService(db)
-
-    # Get detections to export
-    if request.ids:
-        # Export specific IDs
-        detections = []
-        for detection_id in request.ids:
-            detection = await search_service.get_detection_by_id(detection_id)
-            if detection:
-                detections.append(detection)
-    else:
-        # Export filtered or all detections
-        if request.filters:
-            filters = SearchFilters(
-                search=request.filters.search,
-                sources=request.filters.sources,
-                statuses=request.filters.statuses,
-                severities=request.filters.severities,
-                languages=request.filters.languages,
-                mitre_tactics=request.filters.mitre_tactics,
-                mitre_techniques=request.filters.mitre_techniques,
-                tags=request.filters.tags,
-                log_sources=request.filters.log_sources,
-                # Standardized taxonomy filters
-                platforms=request.filters.platforms,
-                event_categories=request.filters.event_categories,
-                data_sources_normalized=request.filters.data_sources_normalized,
-                offset=0,
-                limit=100000,  # Large limit for export
-            )
-        else:
-            filters = SearchFilters(offset=0, limit=100000)
 
-        detections, _ = await search_service.search_detections(filters)
+    Identical exports requested while one is already running share its
+    query and encoding instead of starting their own.
+    """
+    key = (
+        request.format,
+        request.include_raw,
+        tuple(request.ids),
+        request.filters.model_dump_json() if request.filters else None,
+    )
+    shared = _inflight_exports.get(key)
+    subscription = shared.subscribe() if shared is not None else None
+    if subscription is None:
+        # Nothing running, or the running export has already moved past its start
+        shared = _start_export(key, session_maker, request)
+        subscription = shared.subscribe()
 
-    if not detections:
+    try:
+        has_data = await shared.has_data()
+    except Exception:
+        subscription.close()
+        raise
+    if not has_data:
+        subscription.close()
         raise HTTPException(status_code=404, detail="No detections found to export")
 
-    # Generate export
-    if request.format == "json":
-        return _export_json(detections, request.include_raw)
-    else:
-        return _export_csv(detections, request.include_raw)
-
-
-def _export_json(detections: list[Detection], include_raw: bool) -> StreamingResponse:
-    """Export detections as JSON."""
-    data = []
-    for d in detections:
-        item = {
-            "id": d.id,
-            "source": d.source,
-            "source_file": d.source_file,
-            "source_repo_url": d.source_repo_url,
-            "title": d.title,
-            "description": d.description,
-            "author": d.author,
-            "status": d.status,
-            "severity": d.severity,
-            "log_sources": d.log_sources,
-            "data_sources": d.data_sources,
-            "mitre_tactics": d.mitre_tactics,
-            "mitre_techniques": d.mitre_techniques,
-            "detection_logic": d.detection_logic,
-            "tags": d.tags,
-            "created_at": d.created_at.isoformat(),
-            "updated_at": d.updated_at.isoformat(),
-        }
-        if include_raw:
-            item["raw_content"] = d.raw_content
-        data.append(item)
-
-    json_content = json.dumps(data, indent=2)
-
-    return StreamingResponse(
-        io.BytesIO(json_content.encode("utf-8")),
-        media_type="application/json",
-        headers={
-            "Content-Disposition": "attachment; filename=detections_export.json"
-        },
+    filename = f"detections_export.{request.format}"
+    response = StreamingResponse(
+        subscription,
+        media_type="application/json" if request.format == "json" else "text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
+    if _accepts_gzip(accept_encoding):
+        response.body_iterator = _gzip_stream(response.body_iterator)
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
 
-def _export_csv(detections: list[Detection], include_raw: bool) -> StreamingResponse:
-    """Export detections as CSV."""
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Header row
-    headers = [
-        "id",
-        "source",
-        "source_file",
-        "source_repo_url",
-        "title",
-        "description",
-        "author",
-        "status",
-        "severity",
-        "log_sources",
-        "data_sources",
-        "mitre_tactics",
-        "mitre_techniques",
-        "detection_logic",
-        "tags",
-        "created_at",
-        "updated_at",
-    ]
-    if include_raw:
-        headers.append("raw_content")
-
-    writer.writerow(headers)
-
-    # Data rows
-    for d in detections:
-        row = [
-            d.id,
-            d.source,
-            d.source_file,
-            d.source_repo_url,
-            d.title,
-            d.description or "",
-            d.author or "",
-            d.status,
-            d.severity,
-            ",".join(d.log_sources),
-            ",".join(d.data_sources),
-            ",".join(d.mitre_tactics),
-            ",".join(d.mitre_techniques),
-            d.detection_logic,
-            ",".join(d.tags),
-            d.created_at.isoformat(),
-            d.updated_at.isoformat(),
-        ]
-        if include_raw:
-            row.append(d.raw_content)
-
-        writer.writerow(row)
-
-    csv_content = output.getvalue()
-
-    return StreamingResponse(
-        io.BytesIO(csv_content.encode("utf-8")),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=detections_export.csv"
-        },
-    )
+
+def _start_export(
+    key: tuple,
+    session_maker: async_sessionmaker[AsyncSession],
+    request: ExportRequest,
+) -> SharedStream:
+    """Start producing an export and register it for identical requests."""
+    def forget() -> None:
+        # A newer export for the same key may have replaced this one
+        if _inflight_exports.get(key) is shared:
+            del _inflight_exports[key]
+
+    shared = SharedStream(_export_body(session_maker, request), on_done=forget)
+    _inflight_exports[key] = shared
+    return shared
+
+
+async def _export_body(
+    session_maker: async_sessionmaker[AsyncSession],
+    request: ExportRequest,
+) -> AsyncIterator[bytes]:
+    """Yield the encoded export, or nothing if no detections match.
+
+    Runs outside the request that started it (other requests may be
+    sharing it), so it queries on its own session.
+    """
+    async with session_maker() as session:
+        search_service = SearchService(session)
+
+        # Get detections to export
+        if request.ids:
+            # Export specific IDs (one query, in the requested order)
+            found = await search_service.get_detections_by_ids(request.ids, request.include_raw)
+            detections = _iter_list(found)
+        else:
+            # Export filtered or all detections
+            if request.filters:
+                filters = SearchFilters(**request.filters.model_dump())
+            else:
+                filters = SearchFilters()
+
+            detections = search_service.stream_detections(filters, request.include_raw)
+
+        # Peek so an empty export produces no output (reported as a 404)
+        first = await anext(detections, None)
+        if first is None:
+            return
+        detections = _prepend(first, detections)
+
+        if request.format == "json":
+            chunks = _iter_json(detections, request.include_raw)
+        else:
+            chunks = _iter_csv(detections, request.include_raw)
+
+        async for chunk in chunks:
+            yield chunk
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether the client accepts a gzip-encoded response."""
+    if not accept_encoding:
+        return False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        # "gzip;q=0" explicitly refuses the encoding
+        quality = params.replace(" ", "").removeprefix("q=")
+        try:
+            return not quality or float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+async def _gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-compress a byte stream incrementally."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def _iter_list(detections: list[Detection]) -> AsyncIterator[Detection]:
+    """Adapt an already loaded list to the streaming interface."""
+    for detection in detections:
+        yield detection
+
+
+async def _prepend(first: Detection, rest: AsyncIterator[Detection]) -> AsyncIterator[Detection]:
+    """Yield first, then everything remaining in rest."""
+    yield first
+    async for detection in rest:
+        yield detection
+
+
+async def _batched(detections: AsyncIterator[Detection]) -> AsyncIterator[list[Detection]]:
+    """Group a detection stream into lists of EXPORT_BATCH_SIZE."""
+    batch = []
+    async for detection in detections:
+        batch.append(detection)
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _iter_json(detections: AsyncIterator[Detection], include_raw: bool) -> AsyncIterator[bytes]:
+    """Yield the JSON export as encoded chunks, one per batch.
+
+    Serialization runs in a worker thread so large exports don't hold up
+    the event loop; only fetching rows happens on it.
+    """
+    fields = EXPORT_FIELDS_WITH_RAW if include_raw else EXPORT_FIELDS
+    get_values = attrgetter(*fields)
+
+    def encode(batch: list[Detection]) -> bytes:
+        # orjson writes datetimes in ISO 8601 natively
+        return b",\n".join(
+            orjson.dumps(dict(zip(fields, get_values(d))), option=orjson.OPT_INDENT_2)
+            for d in batch
+        )
+
+    separator = b"[\n"
+    async for batch in _batched(detections):
+        yield separator + await asyncio.to_thread(encode, batch)
+        separator = b",\n"
+
+    yield b"[]" if separator == b"[\n" else b"\n]"
+
+
+async def _iter_csv(detections: AsyncIterator[Detection], include_raw: bool) -> AsyncIterator[bytes]:
+    """Yield the CSV export as encoded chunks, one per batch.
+
+    Serialization runs in a worker thread so large exports don't hold up
+    the event loop; only fetching rows happens on it.
+    """
+    fields = EXPORT_FIELDS_WITH_RAW if include_raw else EXPORT_FIELDS
+    get_values = attrgetter(*fields)
+
+    def encode(batch: list[Detection]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        write = buffer.write
+
+        for d in batch:
+            (
+                id_, source, source_file, source_repo_url, title, description,
+                author, status, severity, log_sources, data_sources, mitre_tactics,
+                mitre_techniques, detection_logic, tags, created_at, updated_at,
+                *raw_content,
+            ) = get_values(d)
+            row = [
+                id_,
+                source,
+                source_file,
+                source_repo_url,
+                title,
+                description or "",
+                author or "",
+                status,
+                severity,
+                ",".join(log_sources),
+                ",".join(data_sources),
+                ",".join(mitre_tactics),
+                ",".join(mitre_techniques),
+                detection_logic,
+                ",".join(tags),
+                created_at.isoformat(),
+                updated_at.isoformat(),
+                *raw_content,
+            ]
+
+            # Most rows have nothing to escape; join them directly and only
+            # hand the rest to csv.writer
+            if any(map(_needs_csv_quoting, row)):
+                writer.writerow(row)
+            else:
+                write(",".join(row) + "\r\n")
+
+        return buffer.getvalue().encode("utf-8")
+
+    header = io.StringIO()
+    csv.writer(header).writerow(fields)
+    yield header.getvalue().encode("utf-8")
+
+    async for batch in _batched(detections):
+        yield await asyncio.to_thread(encode, batch)
@@ -1,29 +1,57 @@
 """MITRE ATT&CK API routes."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Any, Callable
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from app.services.mitre import mitre_service
+from app.utils.http import etag_matches
 
 router = APIRouter(prefix="/mitre", tags=["mitre"])
 
+# Serialized payloads keyed by route, tagged with the ETag they were built for
+_payload_cache: dict[str, tuple[str, bytes]] = {}
+
+
+def _cached_json(request: Request, key: str, build: Callable[[], Any]) -> Response:
+    """Serve MITRE data with ETag revalidation and cached serialization.
+
+    The data only changes when it is reloaded, so clients holding the
+    current ETag get a 304 and everyone else gets bytes encoded once per
+    reload instead of once per request.
+    """
+    etag = mitre_service.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    cached = _payload_cache.get(key)
+    if cached is None or cached[0] != etag:
+        cached = (etag, orjson.dumps(build()))
+        _payload_cache[key] = cached
+
+    return Response(content=cached[1], media_type="application/json", headers=headers)
+
 
 @router.get("")
-async def get_mitre_data():
+async def get_mitre_data(request: Request):
     """Get all MITRE ATT&CK tactics and techniques."""
     await mitre_service.ensure_loaded()
 
-    return {
+    return _cached_json(request, "all", lambda: {
         "tactics": mitre_service.get_all_tactics(),
         "techniques": mitre_service.get_all_techniques(),
         "stats": mitre_service.get_stats(),
-    }
+    })
 
 
 @router.get("/tactics")
-async def get_tactics():
+async def get_tactics(request: Request):
     """Get all MITRE ATT&CK tactics."""
     await mitre_service.ensure_loaded()
-    return mitre_service.get_all_tactics()
+    return _cached_json(request, "tactics", mitre_service.get_all_tactics)
 
 
 @router.get("/tactics/{tactic_id}")
@@ -37,10 +65,10 @@ async def get_tactic(tactic_id: str):
 
 
 @router.get("/techniques")
-async def get_techniques():
+async def get_techniques(request: Request):
     """Get all MITRE ATT&CK techniques."""
     await mitre_service.ensure_loaded()
-    return mitre_service.get_all_techniques()
+    return _cached_json(request, "techniques", mitre_service.get_all_techniques)
 
 
 @router.get("/techniques/{technique_id}")
@@ -64,7 +92,7 @@ async def refresh_mitre_data():
 
 
 @router.get("/stats")
-async def get_mitre_stats():
+async def get_mitre_stats(request: Request):
     """Get statistics about loaded MITRE ATT&CK data."""
     await mitre_service.ensure_loaded()
-    return mitre_service.get_stats()
+    return _cached_json(request, "stats", mitre_service.get_stats)
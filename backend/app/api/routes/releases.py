@@ -1,17 +1,32 @@
 """GitHub releases API routes."""
 
 import logging
-from typing import Optional
+from typing import Literal, Optional
 
 import httpx
 from fastapi import APIRouter, HTTPException, Query
 
+from app.services.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/releases", tags=["releases"])
 
+# Simplified release lists keyed by (source, per_page)
+_releases_cache = TTLCache(ttl=300)
+
+# Shared client so connections to api.github.com are kept alive between
+# requests; closed by the application lifespan
+_client: Optional[httpx.AsyncClient] = None
+
+# Last ETag and simplified payload per (url, per_page), for conditional requests
+_release_etags: dict[tuple[str, int], tuple[str, list[dict]]] = {}
+
+# Sources that have GitHub releases
+ReleaseSource = Literal["sigma", "elastic", "splunk"]
+
 # Repositories that have GitHub releases
-RELEASE_REPOS = {
+RELEASE_REPOS: dict[ReleaseSource, dict] = {
     "sigma": {
         "owner": "SigmaHQ",
         "repo": "sigma",
@@ -29,69 +44,107 @@ RELEASE_REPOS = {
     },
 }
 
+# Static payload for list_release_sources
+RELEASE_SOURCES = [
+    {"id": key, "name": value["name"], "owner": value["owner"], "repo": value["repo"]}
+    for key, value in RELEASE_REPOS.items()
+]
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared GitHub API client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared GitHub API client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 @router.get("")
 async def list_release_sources():
     """List all sources that have release notes available."""
-    return [
-        {"id": key, "name": value["name"], "owner": value["owner"], "repo": value["repo"]}
-        for key, value in RELEASE_REPOS.items()
-    ]
+    return RELEASE_SOURCES
 
 
 @router.get("/{source}")
 async def get_releases(
-    source: str,
+    source: ReleaseSource,
     per_page: int = Query(5, ge=1, le=30),
 ):
     """Get GitHub releases for a specific source."""
-    if source not in RELEASE_REPOS:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Source '{source}' does not have release notes. Available: {list(RELEASE_REPOS.keys())}",
-        )
-
     repo_info = RELEASE_REPOS[source]
-    owner = repo_info["owner"]
-    repo = repo_info["repo"]
+    return await _releases_cache.get_or_set(
+        (source, per_page),
+        lambda: _fetch_releases(repo_info["owner"], repo_info["repo"], per_page),
+    )
+
+
+async def _fetch_releases(owner: str, repo: str, per_page: int) -> list[dict]:
+    """Fetch and simplify releases from GitHub.
+
+    Sends the ETag from the previous fetch, so an unchanged release list
+    costs a 304 that does not count against the API rate limit.
+    """
+    url = f"https://api.github.com/repos/{owner}/{repo}/releases"
+    etag_key = (url, per_page)
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    previous = _release_etags.get(etag_key)
+    if previous:
+        headers["If-None-Match"] = previous[0]
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.github.com/repos/{owner}/{repo}/releases",
-                params={"per_page": per_page},
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-                timeout=10.0,
+        response = await get_http_client().get(
+            url,
+            params={"per_page": per_page},
+            headers=headers,
+        )
+
+        if response.status_code == 304 and previous:
+            return previous[1]
+
+        if response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Repository not found")
+
+        if response.status_code == 403:
+            raise HTTPException(
+                status_code=429,
+                detail="GitHub API rate limit exceeded. Try again later.",
             )
 
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Repository not found")
-
-            if response.status_code == 403:
-                raise HTTPException(
-                    status_code=429,
-                    detail="GitHub API rate limit exceeded. Try again later.",
-                )
-
-            response.raise_for_status()
-            releases = response.json()
-
-            # Transform to simpler format
-            return [
-                {
-                    "id": release["id"],
-                    "tag_name": release["tag_name"],
-                    "name": release["name"] or release["tag_name"],
-                    "published_at": release["published_at"],
-                    "html_url": release["html_url"],
-                    "body": release["body"] or "",
-                    "author": release["author"]["login"] if release.get("author") else None,
-                }
-                for release in releases
-            ]
+        response.raise_for_status()
+        releases = response.json()
+
+        # Transform to simpler format
+        result = [
+            {
+                "id": release["id"],
+                "tag_name": release["tag_name"],
+                "name": release["name"] or release["tag_name"],
+                "published_at": release["published_at"],
+                "html_url": release["html_url"],
+                "body": release["body"] or "",
+                "author": release["author"]["login"] if release.get("author") else None,
+            }
+            for release in releases
+        ]
+
+        etag = response.headers.get("ETag")
+        if etag:
+            _release_etags[etag_key] = (etag, result)
+        return result
 
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="GitHub API request timed out")
@@ -1,30 +1,60 @@
 """Repository management API routes."""
 
+import asyncio
+from typing import get_args
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
-from app.api.schemas import RepositoryResponse, SyncResponse, IngestionResponse, IngestionStatsSchema
+from app.database import get_db, get_session_maker
+from app.api.schemas import RepoName, RepositoryResponse, SyncResponse, IngestionResponse, IngestionStatsSchema
 from app.services.repository_sync import RepositorySyncService
 from app.services.ingestion import IngestionService
+from app.services.ingestion_errors import IngestionStats
 
 router = APIRouter(prefix="/repositories", tags=["repositories"])
 
 
-ALL_REPOSITORIES = ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm", "elastic_hunting", "sentinel"]
+ALL_REPOSITORIES = get_args(RepoName)
+
+# Shared stats for runs that never started (not synced) or failed outright;
+# known-valid, so built without validation and never mutated
+_EMPTY_STATS = IngestionStatsSchema.model_construct(
+    discovered=0,
+    skipped_by_filter=0,
+    parsed=0,
+    normalized=0,
+    stored=0,
+    error_count=0,
+    warning_count=0,
+    success_rate=0.0,
+    duration_seconds=None,
+    errors_by_stage={},
+    sample_errors=[],
+)
+_FAILED_STATS = _EMPTY_STATS.model_copy(update={"error_count": 1})
+
+# Bound on repositories synced/ingested at once by the *-all endpoints
+MAX_CONCURRENT_SYNCS = 4
+MAX_CONCURRENT_INGESTS = 4
+
+
+def _writer_limit(session_maker: async_sessionmaker[AsyncSession], limit: int) -> int:
+    """Sessions the *-all endpoints may write from at once.
+
+    SQLite allows a single writer, so only fan out on server databases.
+    """
+    return 1 if session_maker.kw["bind"].dialect.name == "sqlite" else limit
 
 
 @router.get("", response_model=list[RepositoryResponse])
 async def list_repositories(db: AsyncSession = Depends(get_db)):
-    """List all repositories with their sync status."""
-    sync_service = RepositorySyncService(db)
+    """List all repositories with their sync status.
 
-    # Ensure all repositories exist in DB
-    for name in ALL_REPOSITORIES:
-        await sync_service.ensure_repository_exists(name)
-
-    repos = await sync_service.get_all_repositories()
-    return repos
+    Repository rows are created once at startup, so this is read-only.
+    """
+    sync_service = RepositorySyncService(db)
+    return await sync_service.get_all_repositories()
 
 
 @router.get("/{name}", response_model=RepositoryResponse)
@@ -40,11 +70,8 @@ async def get_repository(name: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/{name}/sync", response_model=SyncResponse)
-async def sync_repository(name: str, db: AsyncSession = Depends(get_db)):
+async def sync_repository(name: RepoName, db: AsyncSession = Depends(get_db)):
     """Trigger sync for a specific repository."""
-    if name not in ALL_REPOSITORIES:
-        raise HTTPException(status_code=400, detail=f"Invalid repository name: {name}")
-
     sync_service = RepositorySyncService(db)
     success, message = await sync_service.sync_repository(name)
 
@@ -52,24 +79,24 @@ async def sync_repository(name: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/sync-all", response_model=list[SyncResponse])
-async def sync_all_repositories(db: AsyncSession = Depends(get_db)):
+async def sync_all_repositories(
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),
+):
     """Trigger sync for all repositories."""
-    sync_service = RepositorySyncService(db)
-    results = []
+    semaphore = asyncio.Semaphore(_writer_limit(session_maker, MAX_CONCURRENT_SYNCS))
 
-    for name in ALL_REPOSITORIES:
-        success, message = await sync_service.sync_repository(name)
-        results.append(SyncResponse(success=success, message=message, repository=name))
+    async def sync_one(name: str) -> SyncResponse:
+        # Each task needs its own session; one session can't be shared concurrently
+        async with semaphore, session_maker() as session:
+            success, message = await RepositorySyncService(session).sync_repository(name)
+        return SyncResponse(success=success, message=message, repository=name)
 
-    return results
+    return await asyncio.gather(*(sync_one(name) for name in ALL_REPOSITORIES))
 
 
 @router.post("/{name}/ingest", response_model=IngestionResponse)
-async def ingest_repository(name: str, db: AsyncSession = Depends(get_db)):
+async def ingest_repository(name: RepoName, db: AsyncSession = Depends(get_db)):
     """Ingest detection rules from a synced repository."""
-    if name not in ALL_REPOSITORIES:
-        raise HTTPException(status_code=400, detail=f"Invalid repository name: {name}")
-
     # Check if repository is synced
     sync_service = RepositorySyncService(db)
     repo = await sync_service.get_repository(name)
@@ -84,114 +111,67 @@ async def ingest_repository(name: str, db: AsyncSession = Depends(get_db)):
     ingestion_service = IngestionService(db)
     try:
         stats = await ingestion_service.ingest_repository(name)
-        stats_dict = stats.to_dict()
-
-        # Determine success based on error count and stored rules
-        has_errors = stats.error_count > 0
-        success = stats.stored > 0
-
-        if success and has_errors:
-            message = f"Ingested {stats.stored} rules from {name} with {stats.error_count} errors"
-        elif success:
-            message = f"Successfully ingested {stats.stored} rules from {name}"
-        else:
-            message = f"Ingestion completed but no rules were stored. {stats.error_count} errors occurred."
-
-        return IngestionResponse(
-            success=success,
-            message=message,
-            stats=IngestionStatsSchema(**stats_dict),
-        )
     except Exception as e:
         # Return empty stats on complete failure
-        empty_stats = IngestionStatsSchema(
-            discovered=0,
-            skipped_by_filter=0,
-            parsed=0,
-            normalized=0,
-            stored=0,
-            error_count=1,
-            warning_count=0,
-            success_rate=0.0,
-            duration_seconds=None,
-            errors_by_stage={},
-            sample_errors=[],
-        )
         return IngestionResponse(
             success=False,
             message=f"Ingestion failed: {str(e)}",
-            stats=empty_stats,
+            stats=_FAILED_STATS,
         )
+    return _ingestion_response(name, stats)
 
 
 @router.post("/ingest-all", response_model=list[IngestionResponse])
-async def ingest_all_repositories(db: AsyncSession = Depends(get_db)):
+async def ingest_all_repositories(
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),
+):
     """Ingest detection rules from all synced repositories."""
-    ingestion_service = IngestionService(db)
-    sync_service = RepositorySyncService(db)
-    results = []
-
-    for name in ALL_REPOSITORIES:
-        repo = await sync_service.get_repository(name)
-
-        if not repo or not repo.last_sync_at:
-            empty_stats = IngestionStatsSchema(
-                discovered=0,
-                skipped_by_filter=0,
-                parsed=0,
-                normalized=0,
-                stored=0,
-                error_count=0,
-                warning_count=0,
-                success_rate=0.0,
-                duration_seconds=None,
-                errors_by_stage={},
-                sample_errors=[],
-            )
-            results.append(IngestionResponse(
-                success=False,
-                message=f"Repository {name} has not been synced yet",
-                stats=empty_stats,
-            ))
-            continue
-
-        try:
-            stats = await ingestion_service.ingest_repository(name)
-            stats_dict = stats.to_dict()
-
-            has_errors = stats.error_count > 0
-            success = stats.stored > 0
-
-            if success and has_errors:
-                message = f"Ingested {stats.stored} rules from {name} with {stats.error_count} errors"
-            elif success:
-                message = f"Successfully ingested {stats.stored} rules from {name}"
-            else:
-                message = f"Ingestion completed but no rules were stored. {stats.error_count} errors occurred."
-
-            results.append(IngestionResponse(
-                success=success,
-                message=message,
-                stats=IngestionStatsSchema(**stats_dict),
-            ))
-        except Exception as e:
-            empty_stats = IngestionStatsSchema(
-                discovered=0,
-                skipped_by_filter=0,
-                parsed=0,
-                normalized=0,
-                stored=0,
-                error_count=1,
-                warning_count=0,
-                success_rate=0.0,
-                duration_seconds=None,
-                errors_by_stage={},
-                sample_errors=[],
-            )
-            results.append(IngestionResponse(
-                success=False,
-                message=f"Ingestion failed for {name}: {str(e)}",
-                stats=empty_stats,
-            ))
-
-    return results
+    semaphore = asyncio.Semaphore(_writer_limit(session_maker, MAX_CONCURRENT_INGESTS))
+
+    async def ingest_one(name: str) -> IngestionResponse:
+        async with semaphore, session_maker() as session:
+            return await _ingest_with_session(session, name)
+
+    return await asyncio.gather(*(ingest_one(name) for name in ALL_REPOSITORIES))
+
+
+async def _ingest_with_session(db: AsyncSession, name: str) -> IngestionResponse:
+    """Ingest one repository for ingest-all, reporting failures in the response."""
+    repo = await RepositorySyncService(db).get_repository(name)
+
+    if not repo or not repo.last_sync_at:
+        return IngestionResponse(
+            success=False,
+            message=f"Repository {name} has not been synced yet",
+            stats=_EMPTY_STATS,
+        )
+
+    try:
+        stats = await IngestionService(db).ingest_repository(name)
+    except Exception as e:
+        return IngestionResponse(
+            success=False,
+            message=f"Ingestion failed for {name}: {str(e)}",
+            stats=_FAILED_STATS,
+        )
+    return _ingestion_response(name, stats)
+
+
+def _ingestion_response(name: str, stats: IngestionStats) -> IngestionResponse:
+    """Summarize a finished ingestion run."""
+    # Determine success based on error count and stored rules
+    has_errors = stats.error_count > 0
+    success = stats.stored > 0
+
+    if success and has_errors:
+        message = f"Ingested {stats.stored} rules from {name} with {stats.error_count} errors"
+    elif success:
+        message = f"Successfully ingested {stats.stored} rules from {name}"
+    else:
+        message = f"Ingestion completed but no rules were stored. {stats.error_count} errors occurred."
+
+    return IngestionResponse(
+        success=success,
+        message=message,
+        stats=IngestionStatsSchema(**stats.to_dict()),
+    )
@@ -1,5 +1,6 @@
 """Scheduler and sync job API routes."""
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
@@ -8,6 +9,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.api.schemas import RepoName
 from app.config import settings
 from app.services.scheduler import (
     scheduler,
@@ -50,11 +52,16 @@ class SyncJobResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_orm_fast(cls, job) -> "SyncJobResponse":
+        """Build a response from a trusted SyncJob object or column row without validation."""
+        return cls.model_construct(**{name: getattr(job, name) for name in cls.model_fields})
+
 
 class TriggerSyncRequest(BaseModel):
     """Request model for triggering a sync."""
 
-    repository: Optional[str] = None  # None means all repositories
+    repository: Optional[RepoName] = None  # None means all repositories
 
 
 class TriggerSyncResponse(BaseModel):
@@ -89,7 +96,7 @@ async def get_sync_jobs(
         repository: Filter by repository name
     """
     jobs = await get_sync_job_history(db, limit=limit, repository=repository)
-    return [SyncJobResponse.model_validate(job) for job in jobs]
+    return [SyncJobResponse.from_orm_fast(job) for job in jobs]
 
 
 @router.get("/jobs/latest", response_model=Optional[SyncJobResponse])
@@ -100,7 +107,7 @@ async def get_latest_sync(
     """Get the latest successful sync job."""
     job = await get_last_successful_sync(db, repository=repository)
     if job:
-        return SyncJobResponse.model_validate(job)
+        return SyncJobResponse.from_orm_fast(job)
     return None
 
 
@@ -112,10 +119,17 @@ async def get_sync_job(
     """Get details for a specific sync job."""
     from app.models.sync_job import SyncJob
 
+    # Job IDs are always generated UUIDs; anything else cannot match, and
+    # PostgreSQL's uuid column would reject it rather than find nothing
+    try:
+        job_id = str(uuid.UUID(job_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+
     job = await db.get(SyncJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Sync job not found")
-    return SyncJobResponse.model_validate(job)
+    return SyncJobResponse.from_orm_fast(job)
 
 
 async def _run_sync_in_background(repository: Optional[str], job_id: str):
@@ -139,16 +153,8 @@ async def trigger_sync(
     """
     from app.models.sync_job import SyncJob
 
-    # Validate repository if specified
-    if request.repository:
-        valid_repos = ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm"]
-        if request.repository not in valid_repos:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid repository: {request.repository}. Valid options: {valid_repos}",
-            )
-
-    # Create a pending job record
+    # Create the pending job record before responding, so the returned ID
+    # can be polled right away; the background job updates this row
     job = SyncJob(
         job_type="full",
         repository=request.repository,
@@ -157,13 +163,13 @@ async def trigger_sync(
     )
     db.add(job)
     await db.commit()
-    await db.refresh(job)
 
     # Run sync in background
     background_tasks.add_task(
         scheduler.run_full_sync_job,
         triggered_by="manual",
         repository=request.repository,
+        job_id=job.id,
     )
 
     repo_name = request.repository or "all repositories"
@@ -1,189 +1,243 @@
 """Trending data API routes."""
 
-from datetime import datetime, timedelta
-from typing import Optional
+import hashlib
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Optional
 
-from fastapi import APIRouter, Depends, Query
+import orjson
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy import select, func, cast, String, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.detection import Detection
+from app.models.detection_technique import DetectionTechnique
+from app.services.cache import TTLCache
+from app.services.search import SearchService
+from app.utils.http import etag_matches
 
 router = APIRouter(prefix="/trending", tags=["trending"])
 
+# (ETag, encoded JSON) per query; aggregates only change on ingestion, which invalidates this
+_trending_cache = TTLCache(ttl=300)
 
-@router.get("/techniques")
+
+def _window_start(days: int) -> datetime:
+    """Start of a trending window: midnight UTC, days before today.
+
+    Every endpoint uses the same day boundary, matching the per-day counts
+    behind the summary, so all three count the same rules. It also gives
+    every request on the same day the same cutoff, and so the same cache
+    entry. The result is naive UTC to match the DateTime columns it is
+    compared with.
+    """
+    today = datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+    )
+    return today - timedelta(days=days)
+
+
+async def _render(payload: Awaitable[dict]) -> tuple[str, bytes]:
+    """Serialize a trending payload once with orjson, so it is cached as bytes.
+
+    orjson writes the datetimes in ISO 8601 itself. The body is returned
+    with an ETag derived from it, so polling clients can revalidate.
+    """
+    body = orjson.dumps(await payload)
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"', body
+
+
+def _respond(request: Request, entry: tuple[str, bytes]) -> Response:
+    """Send a rendered trending payload, or a 304 if the client has it."""
+    etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _fold_source_rows(rows) -> tuple[Counter, defaultdict, dict]:
+    """Fold (key, source, count, latest_date) rows into per-key totals.
+
+    Returns:
+        Tuple of (count per key, sources per key, latest date per key)
+    """
+    counts: Counter = Counter()
+    sources: defaultdict[str, list[str]] = defaultdict(list)
+    latest: dict[str, datetime] = {}
+    for key, source, count, latest_date in rows:
+        counts[key] += count
+        sources[key].append(source)
+        if key not in latest or latest_date > latest[key]:
+            latest[key] = latest_date
+    return counts, sources, latest
+
+
+@router.get("/techniques", response_model=None)
 async def get_trending_techniques(
-    days: int = Query(90, ge=7, le=365, description="Number of days to look back"),
+    request: Request,
+    days: int = Query(90, ge=7, le=365, description="Number of whole days (UTC) to look back, plus today"),
     limit: int = Query(15, ge=5, le=50, description="Number of techniques to return"),
     db: AsyncSession = Depends(get_db),
 ):
     """Get trending MITRE techniques based on recently created/modified rules.
 
     Returns techniques ordered by the number of rules created/modified in the time period.
-    """
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-    # Get all detections modified/created after cutoff date
-    query = select(Detection).where(
-        and_(
-            Detection.rule_modified_date.isnot(None),
-            Detection.rule_modified_date >= cutoff_date,
+    The window starts at midnight UTC, `days` days before today, and is
+    returned as cutoff_date. It therefore covers the `days` full days plus
+    today so far, up to 24 hours more than a rolling `days` window.
+    """
+    cutoff_date = _window_start(days)
+    entry = await _trending_cache.get_or_set(
+        ("techniques", cutoff_date, limit),
+        lambda: _render(_trending_techniques(db, days, cutoff_date, limit)),
+    )
+    return _respond(request, entry)
+
+
+async def _trending_techniques(
+    db: AsyncSession,
+    days: int,
+    cutoff_date: datetime,
+    limit: int,
+) -> dict:
+    """Compute the trending techniques response."""
+    # Count per (technique, source) over the precomputed expanded rows;
+    # the date index turns the window into a range scan
+    query = (
+        select(
+            DetectionTechnique.technique_id,
+            DetectionTechnique.source,
+            func.count(),
+            func.max(DetectionTechnique.rule_modified_date),
         )
+        .where(DetectionTechnique.rule_modified_date >= cutoff_date)
+        .group_by(DetectionTechnique.technique_id, DetectionTechnique.source)
     )
-
     result = await db.execute(query)
-    detections = result.scalars().all()
-
-    # Count techniques
-    technique_counts: dict[str, dict] = {}
-    for detection in detections:
-        for technique in detection.mitre_techniques:
-            if technique not in technique_counts:
-                technique_counts[technique] = {
-                    "technique_id": technique,
-                    "count": 0,
-                    "sources": set(),
-                    "latest_date": None,
-                }
-            technique_counts[technique]["count"] += 1
-            technique_counts[technique]["sources"].add(detection.source)
-
-            # Track the most recent rule date for this technique
-            if detection.rule_modified_date:
-                current_latest = technique_counts[technique]["latest_date"]
-                if current_latest is None or detection.rule_modified_date > current_latest:
-                    technique_counts[technique]["latest_date"] = detection.rule_modified_date
+
+    counts, sources, latest = _fold_source_rows(result)
 
     # Sort by count and return top N
-    sorted_techniques = sorted(
-        technique_counts.values(),
-        key=lambda x: (-x["count"], x["technique_id"]),
-    )[:limit]
+    top = sorted(counts, key=lambda t: (-counts[t], t))[:limit]
 
-    # Convert sets to lists and format dates
     return {
         "period_days": days,
-        "cutoff_date": cutoff_date.isoformat(),
+        "cutoff_date": cutoff_date,
         "techniques": [
             {
-                "technique_id": t["technique_id"],
-                "count": t["count"],
-                "sources": list(t["sources"]),
-                "latest_date": t["latest_date"].isoformat() if t["latest_date"] else None,
+                "technique_id": technique,
+                "count": counts[technique],
+                "sources": sorted(sources[technique]),
+                "latest_date": latest[technique],
             }
-            for t in sorted_techniques
+            for technique in top
         ],
     }
 
 
-@router.get("/platforms")
+@router.get("/platforms", response_model=None)
 async def get_trending_platforms(
-    days: int = Query(90, ge=7, le=365, description="Number of days to look back"),
+    request: Request,
+    days: int = Query(90, ge=7, le=365, description="Number of whole days (UTC) to look back, plus today"),
     limit: int = Query(15, ge=5, le=50, description="Number of platforms to return"),
     db: AsyncSession = Depends(get_db),
 ):
     """Get trending platforms based on recently created/modified rules.
 
     Returns platforms ordered by the number of rules created/modified in the time period.
+
+    The window starts at midnight UTC, `days` days before today, and is
+    returned as cutoff_date. It therefore covers the `days` full days plus
+    today so far, up to 24 hours more than a rolling `days` window.
     """
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-    # Get all detections modified/created after cutoff date
-    query = select(Detection).where(
-        and_(
-            Detection.rule_modified_date.isnot(None),
-            Detection.rule_modified_date >= cutoff_date,
-            Detection.platform.isnot(None),
-            Detection.platform != "",
+    cutoff_date = _window_start(days)
+    entry = await _trending_cache.get_or_set(
+        ("platforms", cutoff_date, limit),
+        lambda: _render(_trending_platforms(db, days, cutoff_date, limit)),
+    )
+    return _respond(request, entry)
+
+
+async def _trending_platforms(
+    db: AsyncSession,
+    days: int,
+    cutoff_date: datetime,
+    limit: int,
+) -> dict:
+    """Compute the trending platforms response."""
+    # Count per (platform, source) in the database
+    query = (
+        select(
+            Detection.platform,
+            Detection.source,
+            func.count(),
+            func.max(Detection.rule_modified_date),
         )
+        .where(
+            and_(
+                Detection.rule_modified_date.isnot(None),
+                Detection.rule_modified_date >= cutoff_date,
+                Detection.platform.isnot(None),
+                Detection.platform != "",
+            )
+        )
+        .group_by(Detection.platform, Detection.source)
     )
-
     result = await db.execute(query)
-    detections = result.scalars().all()
-
-    # Count platforms
-    platform_counts: dict[str, dict] = {}
-    for detection in detections:
-        platform = detection.platform
-        if not platform:
-            continue
-
-        if platform not in platform_counts:
-            platform_counts[platform] = {
-                "platform": platform,
-                "count": 0,
-                "sources": set(),
-                "latest_date": None,
-            }
-        platform_counts[platform]["count"] += 1
-        platform_counts[platform]["sources"].add(detection.source)
 
-        # Track the most recent rule date for this platform
-        if detection.rule_modified_date:
-            current_latest = platform_counts[platform]["latest_date"]
-            if current_latest is None or detection.rule_modified_date > current_latest:
-                platform_counts[platform]["latest_date"] = detection.rule_modified_date
+    counts, sources, latest = _fold_source_rows(result)
 
     # Sort by count and return top N
-    sorted_platforms = sorted(
-        platform_counts.values(),
-        key=lambda x: (-x["count"], x["platform"]),
-    )[:limit]
+    top = sorted(counts, key=lambda p: (-counts[p], p))[:limit]
 
-    # Convert sets to lists and format dates
     return {
         "period_days": days,
-        "cutoff_date": cutoff_date.isoformat(),
+        "cutoff_date": cutoff_date,
         "platforms": [
             {
-                "platform": p["platform"],
-                "count": p["count"],
-                "sources": list(p["sources"]),
-                "latest_date": p["latest_date"].isoformat() if p["latest_date"] else None,
+                "platform": platform,
+                "count": counts[platform],
+                "sources": sorted(sources[platform]),
+                "latest_date": latest[platform],
             }
-            for p in sorted_platforms
+            for platform in top
         ],
     }
 
 
-@router.get("/summary")
+@router.get("/summary", response_model=None)
 async def get_trending_summary(
-    days: int = Query(90, ge=7, le=365, description="Number of days to look back"),
+    request: Request,
+    days: int = Query(90, ge=7, le=365, description="Number of whole days (UTC) to look back, plus today"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a summary of recent activity across all sources."""
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-    # Count total rules modified in period
-    total_query = select(func.count(Detection.id)).where(
-        and_(
-            Detection.rule_modified_date.isnot(None),
-            Detection.rule_modified_date >= cutoff_date,
-        )
+    """Get a summary of recent activity across all sources.
+
+    The window starts at midnight UTC, `days` days before today, and is
+    returned as cutoff_date. It therefore covers the `days` full days plus
+    today so far, up to 24 hours more than a rolling `days` window.
+    """
+    cutoff_date = _window_start(days)
+    entry = await _trending_cache.get_or_set(
+        ("summary", cutoff_date),
+        lambda: _render(_trending_summary(db, days, cutoff_date)),
     )
-    total_result = await db.execute(total_query)
-    total_modified = total_result.scalar() or 0
+    return _respond(request, entry)
 
-    # Count by source
-    by_source = {}
-    for source in ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm"]:
-        source_query = select(func.count(Detection.id)).where(
-            and_(
-                Detection.source == source,
-                Detection.rule_modified_date.isnot(None),
-                Detection.rule_modified_date >= cutoff_date,
-            )
-        )
-        source_result = await db.execute(source_query)
-        count = source_result.scalar() or 0
-        if count > 0:
-            by_source[source] = count
+
+async def _trending_summary(db: AsyncSession, days: int, cutoff_date: datetime) -> dict:
+    """Compute the trending summary response."""
+    # Sum the precomputed daily counts for the days in the window (the
+    # cutoff is a day boundary, so this matches the other endpoints)
+    by_source = await SearchService(db).count_modified_by_source(cutoff_date.date())
+    total_modified = sum(by_source.values())
 
     return {
         "period_days": days,
-        "cutoff_date": cutoff_date.isoformat(),
+        "cutoff_date": cutoff_date,
         "total_modified": total_modified,
         "by_source": by_source,
     }
@@ -2,10 +2,19 @@
 
 import re
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
+# Control characters stripped by sanitize_string (keeps tab, newline and
+# carriage return), as a pattern and as a str.translate deletion table.
+# translate is faster on ASCII text but much slower than the regex once a
+# string contains non-ASCII characters.
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_STRIP_CONTROL_CHARS = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f]
+)
+
 
 def sanitize_string(value: str | None) -> str:
     """Sanitize a string for JSON serialization.
@@ -23,10 +32,23 @@ def sanitize_string(value: str | None) -> str:
         value = str(value)
         # Remove null bytes and other problematic control characters
         # Keep common whitespace (tab, newline, carriage return)
-        sanitized = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', value)
-        # Remove surrogate pairs that cause JSON encoding issues
-        sanitized = sanitized.encode('utf-8', errors='surrogateescape').decode('utf-8', errors='replace')
-        return sanitized
+        if value.isprintable():
+            # Nothing to strip (the common case for titles and names)
+            sanitized = value
+        elif value.isascii():
+            sanitized = value.translate(_STRIP_CONTROL_CHARS)
+        else:
+            sanitized = _CONTROL_CHARS.sub('', value)
+        # Remove surrogate pairs that cause JSON encoding issues. ASCII text
+        # can't contain any, and a strict encode only fails if there are some,
+        # so most strings skip the re-encoding round trip.
+        if sanitized.isascii():
+            return sanitized
+        try:
+            sanitized.encode('utf-8')
+            return sanitized
+        except UnicodeEncodeError:
+            return sanitized.encode('utf-8', errors='surrogateescape').decode('utf-8', errors='replace')
     except Exception:
         # If all else fails, return an empty string
         return ""
@@ -77,19 +99,19 @@ class DetectionBase(BaseModel):
     author: Optional[str] = None
     status: str
     severity: str
-    log_sources: list[str] = []
-    data_sources: list[str] = []
+    log_sources: list[str] = Field(default_factory=list)
+    data_sources: list[str] = Field(default_factory=list)
     # Standardized log source taxonomy
     platform: str = ""  # windows, linux, macos, cloud, network, email
     event_category: str = ""  # process, file, network, registry, authentication, etc.
     data_source_normalized: str = ""  # sysmon, auditd, cloudtrail, etc.
-    mitre_tactics: list[str] = []
-    mitre_techniques: list[str] = []
+    mitre_tactics: list[str] = Field(default_factory=list)
+    mitre_techniques: list[str] = Field(default_factory=list)
     detection_logic: str
     language: str = "unknown"
-    tags: list[str] = []
-    references: list[str] = []
-    false_positives: list[str] = []
+    tags: list[str] = Field(default_factory=list)
+    references: list[str] = Field(default_factory=list)
+    false_positives: list[str] = Field(default_factory=list)
     rule_created_date: Optional[datetime] = None
     rule_modified_date: Optional[datetime] = None
 
@@ -119,19 +141,19 @@ class DetectionListItem(BaseModel):
     author: Optional[str] = None
     status: str
     severity: str
-    log_sources: list[str] = []
-    data_sources: list[str] = []
+    log_sources: list[str] = Field(default_factory=list)
+    data_sources: list[str] = Field(default_factory=list)
     # Standardized log source taxonomy
     platform: str = ""
     event_category: str = ""
     data_source_normalized: str = ""
-    mitre_tactics: list[str] = []
-    mitre_techniques: list[str] = []
+    mitre_tactics: list[str] = Field(default_factory=list)
+    mitre_techniques: list[str] = Field(default_factory=list)
     detection_logic: str = ""
     language: str = "unknown"
-    tags: list[str] = []
-    references: list[str] = []
-    false_positives: list[str] = []
+    tags: list[str] = Field(default_factory=list)
+    references: list[str] = Field(default_factory=list)
+    false_positives: list[str] = Field(default_factory=list)
     rule_created_date: Optional[datetime] = None
     rule_modified_date: Optional[datetime] = None
     created_at: datetime  # Sync timestamp
@@ -142,12 +164,20 @@ class DetectionListItem(BaseModel):
 
     @classmethod
     def from_detection(cls, detection) -> "DetectionListItem":
-        """Create a list item from a detection.
+        """Create a list item from a detection or a projected detection row.
 
         Sanitizes string fields to handle control characters that could
-        cause JSON serialization failures.
+        cause JSON serialization failures. The model is built with
+        model_construct(), skipping Pydantic validation, so only pass rows
+        read from the detections table (which already satisfy the schema);
+        validate anything else with DetectionListItem(**data).
         """
-        data = {
+        return cls.model_construct(**cls._fields_from_detection(detection))
+
+    @staticmethod
+    def _fields_from_detection(detection) -> dict:
+        """Extract sanitized list-item fields from a detection or row."""
+        return {
             "id": str(detection.id),
             "source": detection.source,
             "source_file": sanitize_string(detection.source_file),
@@ -161,13 +191,13 @@ class DetectionListItem(BaseModel):
             "severity": detection.severity,
             "log_sources": normalize_string_list(detection.log_sources),
             "data_sources": normalize_string_list(detection.data_sources),
-            "platform": sanitize_string(detection.platform) or "",
-            "event_category": sanitize_string(detection.event_category) or "",
-            "data_source_normalized": sanitize_string(detection.data_source_normalized) or "",
+            "platform": sanitize_string(detection.platform),
+            "event_category": sanitize_string(detection.event_category),
+            "data_source_normalized": sanitize_string(detection.data_source_normalized),
             "mitre_tactics": normalize_string_list(detection.mitre_tactics),
             "mitre_techniques": normalize_string_list(detection.mitre_techniques),
-            "detection_logic": sanitize_string(detection.detection_logic) or "",
-            "language": detection.language or "unknown",
+            "detection_logic": sanitize_string(detection.detection_logic),
+            "language": detection.language,
             "tags": normalize_string_list(detection.tags),
             "references": normalize_string_list(detection.references),
             "false_positives": normalize_string_list(detection.false_positives),
@@ -176,7 +206,6 @@ class DetectionListItem(BaseModel):
             "created_at": detection.created_at,
             "updated_at": detection.updated_at,
         }
-        return cls(**data)
 
 
 class DetectionListResponse(BaseModel):
@@ -189,6 +218,12 @@ class DetectionListResponse(BaseModel):
 
 
 # Repository schemas
+RepoName = Literal[
+    "sigma", "elastic", "splunk", "sublime", "elastic_protections",
+    "lolrmm", "elastic_hunting", "sentinel",
+]
+
+
 class RepositoryResponse(BaseModel):
     """Repository metadata response."""
 
@@ -1,21 +1,132 @@
 """Database configuration and session management."""
 
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Annotated
+
+from sqlalchemy import CheckConstraint, DateTime, String, Uuid, event, inspect, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, mapped_column
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import AddConstraint
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
     pass
 
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
+# UUID keys: a native 16-byte uuid column on PostgreSQL, 36-character text on
+# SQLite (matching existing database files). Values are str in Python either way.
+UUIDString = Uuid(as_uuid=False).with_variant(String(36), "sqlite")
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database.
+
+    Used as the timestamp columns' server default (for rows written outside
+    the app) and as Detection.updated_at's UPDATE value. Matches the naive
+    UTC values the application compares against.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _sqlite_utcnow(element, compiler, **kw):
+    # Microsecond text in the format SQLAlchemy stores SQLite datetimes in
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+def utcnow_value() -> datetime:
+    """Current UTC time as a naive datetime, computed in Python.
+
+    The insert-side counterpart of utcnow(): timestamp columns send this
+    value explicitly, so inserts work on tables created before the server
+    defaults were added (create_all never alters existing tables).
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Column specs shared by every model, declared once as Annotated aliases:
+# ``id: Mapped[uuid_pk]`` and ``created_at: Mapped[created_ts]``
+uuid_pk = Annotated[
+    str,
+    mapped_column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4())),
+]
+created_ts = Annotated[
+    datetime,
+    mapped_column(DateTime, nullable=False, default=utcnow_value, server_default=utcnow()),
+]
+
+
+def _engine_options() -> dict:
+    """Build engine keyword arguments for the configured database."""
+    options = {"echo": settings.log_sql, "echo_pool": False}
+    if settings.database_url.startswith("sqlite"):
+        return options
+    if settings.db_external_pooler:
+        # The external pooler owns the connections, so don't pool them twice.
+        # Its transaction mode hands each transaction to any server
+        # connection, which breaks asyncpg's per-connection prepared statements.
+        options.update(
+            poolclass=NullPool,
+            connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+        )
+    else:
+        # Size the pool for concurrent requests that each hold a connection
+        # across several awaits
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    return options
+
+
+engine = create_async_engine(settings.database_url, **_engine_options())
+
+# Per-connection SQLite tuning: WAL lets readers run alongside ingestion's
+# writes, and synchronous=NORMAL only fsyncs at checkpoints in WAL mode
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
 )
 
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply SQLITE_PRAGMAS to each new connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -26,13 +137,144 @@ async_session_maker = async_sessionmaker(
 async def get_db() -> AsyncSession:
     """Dependency for getting database sessions."""
     async with async_session_maker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Dependency for work that opens its own sessions outside the request."""
+    return async_session_maker
+
+
+async def warm_pool() -> None:
+    """Open pool_size connections up front so early requests don't pay connect cost.
+
+    The connections are returned to the pool immediately. No-op for SQLite,
+    where connecting is just opening a file, and behind an external pooler,
+    where the app keeps no connections of its own.
+    """
+    if engine.dialect.name == "sqlite" or settings.db_external_pooler:
+        return
+
+    async def _checkout() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_checkout() for _ in range(settings.db_pool_size)))
 
 
 async def init_db() -> None:
-    """Initialize the database, creating all tables."""
+    """Initialize the database, creating all tables and any missing indexes and constraints."""
     async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Trigram operator classes used by the detections search indexes
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+
+
+# Column types PostgreSQL converts existing columns to in place
+# (json -> jsonb, varchar(36) -> uuid)
+CONVERTIBLE_TYPES = ("JSONB", "UUID")
+
+
+def _column_type_upgrades(table, existing_columns, dialect) -> list[tuple]:
+    """ALTER statements for columns whose database type predates the model's.
+
+    Args:
+        table: Model table
+        existing_columns: The table's columns as reflected by the inspector
+        dialect: Dialect the statements are rendered for
+
+    Returns:
+        List of (column, ALTER TABLE statement) tuples
+    """
+    existing = {column["name"]: column["type"].compile(dialect=dialect) for column in existing_columns}
+    preparer = dialect.identifier_preparer
+    upgrades = []
+    for column in table.columns:
+        target = column.type.compile(dialect=dialect)
+        if target not in CONVERTIBLE_TYPES or existing.get(column.name, target) == target:
+            continue
+        name = preparer.quote(column.name)
+        upgrades.append((
+            column,
+            f"ALTER TABLE {preparer.format_table(table)} "
+            f"ALTER COLUMN {name} TYPE {target} USING {name}::{target}",
+        ))
+    return upgrades
+
+
+def _upgrade_schema(conn) -> None:
+    """Bring tables that create_all skips up to the current models.
+
+    create_all only creates missing tables, so a column type, index or
+    constraint changed on a model later never reaches a database created
+    before it. Each one is checked first, so this is a no-op once applied.
+    """
+    if conn.dialect.name == "postgresql":
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            upgrades = _column_type_upgrades(table, inspector.get_columns(table.name), conn.dialect)
+            for column, statement in upgrades:
+                # Indexes on the column may have been built over a cast to
+                # the new type; drop them so they are recreated from the model
+                for index in table.indexes:
+                    if index.columns.contains_column(column):
+                        index.drop(conn, checkfirst=True)
+                conn.execute(text(statement))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+    if conn.dialect.name != "postgresql":
+        # SQLite can't add a constraint to an existing table
+        return
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {check["name"] for check in inspector.get_check_constraints(table.name)}
+        unvalidated = set(conn.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = CAST(:table AS regclass) AND contype = 'c' AND NOT convalidated"
+            ),
+            {"table": table.name},
+        ).scalars())
+        for constraint in table.constraints:
+            if not isinstance(constraint, CheckConstraint):
+                continue
+            if constraint.name not in existing:
+                # NOT VALID applies it to new writes without the ALTER
+                # failing on existing rows; they are checked separately below
+                add = AddConstraint(constraint).compile(dialect=conn.dialect)
+                conn.execute(text(f"{add} NOT VALID"))
+            elif constraint.name not in unvalidated:
+                continue
+            _validate_check_constraint(conn, table, constraint)
+
+
+def _constraint_violations(conn, table, constraint: CheckConstraint) -> list:
+    """Distinct values of a CHECK constraint's column that existing rows break it with."""
+    column = table.c[constraint.info["column"]]
+    query = select(column).where(text(f"NOT ({constraint.sqltext})")).distinct().order_by(column)
+    return list(conn.execute(query).scalars())
+
+
+def _validate_check_constraint(conn, table, constraint: CheckConstraint) -> None:
+    """Validate a NOT VALID CHECK constraint once no existing row breaks it.
+
+    Otherwise the offending values are logged for cleanup and startup
+    carries on; a later startup validates the constraint once they are fixed.
+    """
+    violations = _constraint_violations(conn, table, constraint)
+    if violations:
+        logger.warning(
+            f"Existing {table.name} rows violate {constraint.name} with values {violations}; "
+            "it only applies to new writes until they are fixed"
+        )
+        return
+    preparer = conn.dialect.identifier_preparer
+    conn.execute(text(
+        f"ALTER TABLE {preparer.format_table(table)} "
+        f"VALIDATE CONSTRAINT {preparer.format_constraint(constraint)}"
+    ))
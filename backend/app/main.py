@@ -7,11 +7,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import init_db
+from app.database import init_db, async_session_maker, warm_pool
 # Import models to register them with SQLAlchemy Base before init_db
-from app.models import Detection, Repository, SyncJob  # noqa: F401
+from app.models import DailyDetectionCount, Detection, DetectionTechnique, Repository, SyncJob, TechniqueCount  # noqa: F401
 from app.api.routes import detections, repositories, export, compare, releases, mitre, scheduler as scheduler_routes, trending
+from app.services.repository_sync import RepositorySyncService
 from app.services.scheduler import scheduler
+from app.services.search import SearchService
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,22 @@ async def lifespan(app: FastAPI):
     settings.data_dir.mkdir(parents=True, exist_ok=True)
     settings.repos_dir.mkdir(parents=True, exist_ok=True)
     await init_db()
+    await warm_pool()
+
+    async with async_session_maker() as session:
+        # Backfill precomputed technique coverage, trending rows and daily
+        # counts, only when they don't match detections (e.g. for databases
+        # created before those tables existed); ingestion keeps them current
+        search_service = SearchService(session)
+        if await search_service.precomputed_counts_stale():
+            logger.info("Rebuilding precomputed detection counts")
+            await search_service.refresh_technique_counts()
+            await search_service.refresh_detection_techniques()
+            await search_service.refresh_daily_counts()
+            await session.commit()
+
+        # Create metadata rows for all repositories up front
+        await RepositorySyncService(session).ensure_all_repositories()
 
     # Start scheduler if enabled
     if settings.enable_scheduler:
@@ -36,6 +54,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     if scheduler.is_running:
         scheduler.stop()
+    await releases.close_http_client()
 
 
 app = FastAPI(
@@ -45,10 +64,11 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Configure CORS
+# Configure CORS. Starlette builds the response header strings once here;
+# a frozenset makes the per-request origin check a hash lookup.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins,
+    allow_origins=frozenset(settings.cors_origins),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -1,7 +1,10 @@
 """Database models."""
 
+from app.models.daily_count import DailyDetectionCount
 from app.models.detection import Detection
+from app.models.detection_technique import DetectionTechnique
 from app.models.repository import Repository
 from app.models.sync_job import SyncJob
+from app.models.technique_count import TechniqueCount
 
-__all__ = ["Detection", "Repository", "SyncJob"]
+__all__ = ["DailyDetectionCount", "Detection", "DetectionTechnique", "Repository", "SyncJob", "TechniqueCount"]
@@ -0,0 +1,28 @@
+"""Precomputed per-source daily counts of modified rules."""
+
+from datetime import date
+
+from sqlalchemy import String, Integer, Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DailyDetectionCount(Base):
+    """Number of detections per (source, day of rule_modified_date).
+
+    Rebuilt for a source after each ingestion, so the trending summary sums
+    a few rows per day in its window instead of scanning the detections.
+    """
+
+    __tablename__ = "detection_daily_counts"
+
+    source: Mapped[str] = mapped_column(String(20), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    detection_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<DailyDetectionCount(source={self.source}, day={self.day}, "
+            f"detection_count={self.detection_count})>"
+        )
@@ -2,12 +2,32 @@
 
 from datetime import datetime
 from typing import Optional
-import uuid
 
-from sqlalchemy import String, Text, DateTime, JSON, Index
+from sqlalchemy import CheckConstraint, String, Text, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, created_ts, utcnow, utcnow_value, uuid_pk
+
+# List columns: binary jsonb on PostgreSQL (no reparse per row, GIN-indexable),
+# plain JSON text elsewhere
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
+# Values the normalizers map status and severity onto (see BaseNormalizer)
+DETECTION_STATUSES = ("stable", "experimental", "deprecated", "unknown")
+DETECTION_SEVERITIES = ("low", "medium", "high", "critical", "unknown")
+
+
+def _one_of(column: str, values: tuple[str, ...]) -> CheckConstraint:
+    """CHECK constraint limiting a column to a fixed set of values.
+
+    The column name is kept in the constraint's info, so startup can report
+    existing values that violate it (see app.database).
+    """
+    allowed = ", ".join(f"'{value}'" for value in values)
+    return CheckConstraint(
+        f"{column} IN ({allowed})", name=f"ck_detections_{column}", info={"column": column}
+    )
 
 
 class Detection(Base):
@@ -16,11 +36,7 @@ class Detection(Base):
     __tablename__ = "detections"
 
     # Primary key - UUID for global uniqueness
-    id: Mapped[str] = mapped_column(
-        String(36),
-        primary_key=True,
-        default=lambda: str(uuid.uuid4()),
-    )
+    id: Mapped[uuid_pk]
 
     # Source information
     source: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
@@ -51,8 +67,8 @@ class Detection(Base):
     )
 
     # Classification arrays (stored as JSON)
-    log_sources: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
-    data_sources: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    log_sources: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
+    data_sources: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
 
     # Standardized log source taxonomy
     platform: Mapped[str] = mapped_column(
@@ -75,8 +91,8 @@ class Detection(Base):
     )
 
     # MITRE ATT&CK mapping
-    mitre_tactics: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
-    mitre_techniques: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    mitre_tactics: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
+    mitre_techniques: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
 
     # Detection logic - human-readable summary
     detection_logic: Mapped[str] = mapped_column(Text, nullable=False)
@@ -90,39 +106,85 @@ class Detection(Base):
     )
 
     # Tags for classification
-    tags: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    tags: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
 
     # References (external links, CVEs, etc.)
-    references: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    references: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
 
     # False positives / known limitations
-    false_positives: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    false_positives: Mapped[list] = mapped_column(JSONList, nullable=False, default=list)
 
-    # Original rule content
-    raw_content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Original rule content. Deferred with raiseload: it is by far the largest
+    # column, so queries must opt in with undefer() to load it.
+    raw_content: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        deferred=True,
+        deferred_raiseload=True,
+    )
 
     # Rule dates (from source)
     rule_created_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     rule_modified_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Timestamps (sync timestamps)
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        nullable=False,
-        default=datetime.utcnow,
-    )
+    created_at: Mapped[created_ts]
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        default=utcnow_value,
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
 
     # Indexes for common queries
     __table_args__ = (
         Index("ix_detections_title", "title"),
         Index("ix_detections_source_file", "source_file"),
+        # Browsing one source in the default title order reads the index in
+        # order and stops at the page limit instead of sorting every match
+        Index("ix_detections_source_title", "source", "title"),
+        # Source plus taxonomy/severity filters used together by the UI
+        Index("ix_detections_source_platform_severity", "source", "platform", "severity"),
+        # Keep the small status/severity vocabularies closed, so a normalizer
+        # bug surfaces at ingestion instead of as a stray filter value
+        _one_of("status", DETECTION_STATUSES),
+        _one_of("severity", DETECTION_SEVERITIES),
     )
 
+    # Fetch the database-generated updated_at back on UPDATE as well as
+    # INSERT (via RETURNING), so it never needs a lazy load in async code
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return f"<Detection(id={self.id}, source={self.source}, title={self.title[:50]})>"
+
+
+# GIN index for technique containment queries (mitre_techniques @> '["T1059"]').
+# PostgreSQL only, where the column is jsonb.
+Index(
+    "ix_detections_mitre_techniques_gin",
+    Detection.__table__.c.mitre_techniques,
+    postgresql_using="gin",
+    postgresql_ops={"mitre_techniques": "jsonb_path_ops"},
+).ddl_if(dialect="postgresql")
+
+# Partial index for the trending queries, which all filter on
+# rule_modified_date >= cutoff and skip rules without a date.
+Index(
+    "ix_detections_rule_modified_date",
+    Detection.__table__.c.rule_modified_date.desc(),
+    postgresql_where=Detection.__table__.c.rule_modified_date.isnot(None),
+    sqlite_where=Detection.__table__.c.rule_modified_date.isnot(None),
+)
+
+# Trigram GIN indexes for the keyword search, which matches ILIKE '%term%'
+# against these columns; a B-tree can't serve a leading wildcard. PostgreSQL
+# only (init_db creates the pg_trgm extension).
+for _column in ("title", "description", "detection_logic", "raw_content"):
+    Index(
+        f"ix_detections_{_column}_trgm",
+        Detection.__table__.c[_column],
+        postgresql_using="gin",
+        postgresql_ops={_column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
@@ -0,0 +1,39 @@
+"""Precomputed (detection, technique) rows for trending queries."""
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base, UUIDString
+
+
+class DetectionTechnique(Base):
+    """One row per technique referenced by a detection with a modified date.
+
+    Derived from Detection.mitre_techniques and rebuilt for a source after
+    each ingestion, so trending reads an indexed range of narrow rows
+    instead of expanding every detection's technique array per request.
+    Detections without a rule_modified_date never trend and are left out.
+    """
+
+    __tablename__ = "detection_techniques"
+
+    detection_id: Mapped[str] = mapped_column(UUIDString, primary_key=True)
+    technique_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    source: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    rule_modified_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<DetectionTechnique(detection_id={self.detection_id}, "
+            f"technique_id={self.technique_id}, source={self.source})>"
+        )
+
+
+# Trending scans a rule_modified_date range and groups by technique
+Index(
+    "ix_detection_techniques_modified_technique",
+    DetectionTechnique.rule_modified_date,
+    DetectionTechnique.technique_id,
+)
@@ -2,12 +2,11 @@
 
 from datetime import datetime
 from typing import Optional
-import uuid
 
 from sqlalchemy import String, DateTime, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, created_ts, uuid_pk
 
 
 class Repository(Base):
@@ -16,11 +15,7 @@ class Repository(Base):
     __tablename__ = "repositories"
 
     # Primary key
-    id: Mapped[str] = mapped_column(
-        String(36),
-        primary_key=True,
-        default=lambda: str(uuid.uuid4()),
-    )
+    id: Mapped[uuid_pk]
 
     # Repository identification
     name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
@@ -42,11 +37,7 @@ class Repository(Base):
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        nullable=False,
-        default=datetime.utcnow,
-    )
+    created_at: Mapped[created_ts]
 
     def __repr__(self) -> str:
         return f"<Repository(name={self.name}, status={self.status})>"
@@ -2,12 +2,11 @@
 
 from datetime import datetime
 from typing import Optional
-import uuid
 
 from sqlalchemy import String, DateTime, Integer, Text, Float, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, created_ts, uuid_pk
 
 
 class SyncJob(Base):
@@ -16,11 +15,7 @@ class SyncJob(Base):
     __tablename__ = "sync_jobs"
 
     # Primary key
-    id: Mapped[str] = mapped_column(
-        String(36),
-        primary_key=True,
-        default=lambda: str(uuid.uuid4()),
-    )
+    id: Mapped[uuid_pk]
 
     # Job identification
     job_type: Mapped[str] = mapped_column(
@@ -65,11 +60,7 @@ class SyncJob(Base):
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        nullable=False,
-        default=datetime.utcnow,
-    )
+    created_at: Mapped[created_ts]
 
     def __repr__(self) -> str:
         return f"<SyncJob(id={self.id[:8]}, type={self.job_type}, status={self.status})>"
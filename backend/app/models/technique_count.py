@@ -0,0 +1,27 @@
+"""Precomputed per-source technique coverage counts."""
+
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class TechniqueCount(Base):
+    """Number of detections per (source, technique) pair.
+
+    Derived from Detection.mitre_techniques and rebuilt for a source after
+    each ingestion, so coverage endpoints read a small precomputed table
+    instead of expanding every detection's technique array per request.
+    """
+
+    __tablename__ = "detection_technique_counts"
+
+    source: Mapped[str] = mapped_column(String(20), primary_key=True)
+    technique_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    detection_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TechniqueCount(source={self.source}, technique_id={self.technique_id}, "
+            f"detection_count={self.detection_count})>"
+        )
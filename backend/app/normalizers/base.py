@@ -2,13 +2,187 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 import hashlib
 
 from app.parsers.base import ParsedRule
 from app.services.log_source_taxonomy import standardize_log_sources
 
+# Date formats seen in rule metadata that fromisoformat can't parse, keyed by
+# the character after a leading four-digit year so only formats of the right
+# shape are tried ("%Y-%m-%d" catches unpadded months and days)
+_FALLBACK_DATE_FORMATS: dict[str, tuple[str, ...]] = {
+    "-": ("%Y-%m-%d",),
+    "/": ("%Y/%m/%d",),
+}
+# Everything else: day or month first
+_DAY_FIRST_DATE_FORMATS = ("%d/%m/%Y", "%m/%d/%Y")
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(date_str: str) -> Optional[datetime]:
+    """Parse a date string for BaseNormalizer.parse_date.
+
+    Cached because rules from the same repository share a small set of
+    dates; datetimes are immutable, so sharing results is safe.
+    """
+    # ISO 8601 (by far the most common) goes through the C parser
+    if date_str[4:5] == "-":
+        try:
+            parsed = datetime.fromisoformat(date_str.removesuffix("Z"))
+        except ValueError:
+            pass
+        else:
+            # Dates are stored as naive UTC
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+    year_separator = date_str[4:5] if date_str[:4].isdigit() else ""
+    for fmt in _FALLBACK_DATE_FORMATS.get(year_separator, _DAY_FIRST_DATE_FORMATS):
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# Raw status and severity spellings mapped onto the normalized values;
+# anything else normalizes to "unknown"
+_STATUS_MAP: dict[str, str] = {
+    **dict.fromkeys(("stable", "production", "released"), "stable"),
+    **dict.fromkeys(("experimental", "test", "testing", "development", "dev"), "experimental"),
+    **dict.fromkeys(("deprecated", "obsolete", "retired"), "deprecated"),
+}
+_SEVERITY_MAP: dict[str, str] = {
+    **dict.fromkeys(("informational", "info", "low"), "low"),
+    **dict.fromkeys(("medium", "moderate"), "medium"),
+    "high": "high",
+    **dict.fromkeys(("critical", "severe"), "critical"),
+}
+
+# Mapping of patterns to standardized data source names, used by
+# BaseNormalizer.normalize_data_sources
+_DATA_SOURCE_MAPPING: dict[str, str] = {
+    # Windows Event Logs
+    "sysmon": "Sysmon",
+    "security": "Windows Security",
+    "security_event": "Windows Security",
+    "wineventlog": "Windows Event Log",
+    "windows_event": "Windows Event Log",
+    "system_event": "Windows System",
+    "powershell": "PowerShell",
+    "powershell_script": "PowerShell Script Block",
+    "wmi": "WMI",
+    "registry": "Windows Registry",
+    "file_monitoring": "File Monitoring",
+    "process_creation": "Process Creation",
+    "network_connection": "Network Connection",
+    "dns": "DNS",
+    "dns_query": "DNS",
+    "image_load": "Image Load",
+    "driver_load": "Driver Load",
+    "pipe_created": "Named Pipe",
+    "firewall": "Windows Firewall",
+    "create_remote_thread": "Remote Thread",
+    "process_access": "Process Access",
+    "file_event": "File Monitoring",
+    "create_stream_hash": "Alternate Data Stream",
+
+    # Endpoint/EDR
+    "endpoint": "Endpoint",
+    "behavior_event": "Behavior Detection",
+    "edr": "EDR",
+
+    # Network
+    "network": "Network Traffic",
+    "netflow": "NetFlow",
+    "packet": "Packet Capture",
+    "proxy": "Web Proxy",
+    "webproxy": "Web Proxy",
+    "firewall_logs": "Firewall",
+    "ids": "IDS/IPS",
+    "zeek": "Zeek",
+
+    # Cloud
+    "aws": "AWS CloudTrail",
+    "cloudtrail": "AWS CloudTrail",
+    "azure": "Azure Activity",
+    "gcp": "GCP Audit",
+    "cloud": "Cloud",
+    "o365": "Office 365",
+    "m365": "Microsoft 365",
+    "okta": "Okta",
+    "github": "GitHub",
+
+    # Linux/macOS
+    "linux_syslog": "Linux Syslog",
+    "linux": "Linux",
+    "auditd": "Linux Auditd",
+    "macos_logs": "macOS Logs",
+    "macos": "macOS",
+    "unix": "Unix/Linux",
+
+    # Email
+    "email": "Email",
+    "smtp": "SMTP",
+
+    # Authentication
+    "authentication": "Authentication",
+    "active_directory": "Active Directory",
+    "ldap": "LDAP",
+
+    # RMM specific
+    "rmm_tool": "RMM Tool",
+
+    # Web/Application
+    "application": "Application",
+    "webserver": "Web Server",
+    "antivirus": "Antivirus",
+}
+
+# Partial-match candidates in table order; the first pattern contained in a
+# source wins
+_DATA_SOURCE_PATTERNS = tuple(_DATA_SOURCE_MAPPING.items())
+
+
+@lru_cache(maxsize=1024)
+def _map_data_sources(raw_sources: tuple[str, ...]) -> tuple[str, ...]:
+    """Map raw data source names for BaseNormalizer.normalize_data_sources.
+
+    Cached because rules from one repository repeat the same combinations
+    of raw sources.
+    """
+    normalized = []
+    seen = set()
+
+    for source in raw_sources:
+        if not source:
+            continue
+
+        source_lower = source.lower().strip()
+
+        # Try exact match first, then the first pattern it contains
+        mapped = _DATA_SOURCE_MAPPING.get(source_lower) or next(
+            (mapped for pattern, mapped in _DATA_SOURCE_PATTERNS if pattern in source_lower),
+            None,
+        )
+        if mapped:
+            if mapped not in seen:
+                normalized.append(mapped)
+                seen.add(mapped)
+            continue
+
+        # If no match, clean up and include as-is
+        # Capitalize words and replace underscores
+        clean = source.replace("_", " ").title()
+        if clean not in seen:
+            normalized.append(clean)
+            seen.add(clean)
+
+    return tuple(normalized)
+
 
 @dataclass
 class NormalizedDetection:
@@ -86,6 +260,8 @@ class BaseNormalizer(ABC):
             repo_url: Base URL for the source repository
         """
         self.repo_url = repo_url
+        # Browsable base URL for build_source_rule_url
+        self._repo_web_url = repo_url.removesuffix(".git")
 
     @abstractmethod
     def normalize(self, parsed: ParsedRule) -> NormalizedDetection:
@@ -126,14 +302,7 @@ class BaseNormalizer(ABC):
         if not status:
             return "unknown"
 
-        status_lower = status.lower()
-        if status_lower in ["stable", "production", "released"]:
-            return "stable"
-        elif status_lower in ["experimental", "test", "testing", "development", "dev"]:
-            return "experimental"
-        elif status_lower in ["deprecated", "obsolete", "retired"]:
-            return "deprecated"
-        return "unknown"
+        return _STATUS_MAP.get(status.lower(), "unknown")
 
     def normalize_severity(self, severity: Optional[str]) -> str:
         """Normalize severity to standard values.
@@ -147,16 +316,7 @@ class BaseNormalizer(ABC):
         if not severity:
             return "unknown"
 
-        severity_lower = severity.lower()
-        if severity_lower in ["informational", "info", "low"]:
-            return "low"
-        elif severity_lower in ["medium", "moderate"]:
-            return "medium"
-        elif severity_lower in ["high"]:
-            return "high"
-        elif severity_lower in ["critical", "severe"]:
-            return "critical"
-        return "unknown"
+        return _SEVERITY_MAP.get(severity.lower(), "unknown")
 
     def normalize_log_sources(self, log_source: dict) -> list[str]:
         """Extract normalized log source identifiers.
@@ -167,23 +327,10 @@ class BaseNormalizer(ABC):
         Returns:
             List of normalized log source strings
         """
-        sources = []
-
-        product = log_source.get("product")
-        if product:
-            sources.append(product.lower())
-
-        category = log_source.get("category")
-        if category:
-            sources.append(category.lower())
-
-        service = log_source.get("service")
-        if service:
-            sources.append(service.lower())
+        values = (log_source.get(key) for key in ("product", "category", "service"))
 
         # Remove duplicates while preserving order
-        seen = set()
-        return [s for s in sources if not (s in seen or seen.add(s))]
+        return list(dict.fromkeys(value.lower() for value in values if value))
 
     def parse_date(self, date_value) -> Optional[datetime]:
         """Parse a date value from various formats.
@@ -205,24 +352,7 @@ class BaseNormalizer(ABC):
             return datetime(date_value.year, date_value.month, date_value.day)
 
         if isinstance(date_value, str):
-            date_str = date_value.strip()
-            # Try various date formats
-            formats = [
-                "%Y-%m-%d",
-                "%Y/%m/%d",
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%dT%H:%M:%S.%f",
-                "%Y-%m-%dT%H:%M:%S.%fZ",
-                "%Y-%m-%d %H:%M:%S",
-                "%d/%m/%Y",
-                "%m/%d/%Y",
-            ]
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
+            return _parse_date_str(date_value.strip())
 
         return None
 
@@ -236,20 +366,11 @@ class BaseNormalizer(ABC):
         Returns:
             Full URL to view the rule file
         """
-        # Ensure consistent path separators
-        file_path = file_path.replace("\\", "/")
-
-        # Remove leading slash if present
-        if file_path.startswith("/"):
-            file_path = file_path[1:]
-
-        # Strip .git suffix from repo URL if present
-        repo_url = self.repo_url
-        if repo_url.endswith(".git"):
-            repo_url = repo_url[:-4]
+        # Consistent path separators, without a leading slash
+        file_path = file_path.replace("\\", "/").removeprefix("/")
 
         # Build the GitHub URL
-        return f"{repo_url}/blob/{branch}/{file_path}"
+        return f"{self._repo_web_url}/blob/{branch}/{file_path}"
 
     def normalize_references(self, references) -> list[str]:
         """Normalize references to a list of strings.
@@ -339,118 +460,4 @@ class BaseNormalizer(ABC):
         Returns:
             List of normalized data source categories
         """
-        # Mapping of patterns to standardized data source names
-        data_source_mapping = {
-            # Windows Event Logs
-            "sysmon": "Sysmon",
-            "security": "Windows Security",
-            "security_event": "Windows Security",
-            "wineventlog": "Windows Event Log",
-            "windows_event": "Windows Event Log",
-            "system_event": "Windows System",
-            "powershell": "PowerShell",
-            "powershell_script": "PowerShell Script Block",
-            "wmi": "WMI",
-            "registry": "Windows Registry",
-            "file_monitoring": "File Monitoring",
-            "process_creation": "Process Creation",
-            "network_connection": "Network Connection",
-            "dns": "DNS",
-            "dns_query": "DNS",
-            "image_load": "Image Load",
-            "driver_load": "Driver Load",
-            "pipe_created": "Named Pipe",
-            "firewall": "Windows Firewall",
-            "create_remote_thread": "Remote Thread",
-            "process_access": "Process Access",
-            "file_event": "File Monitoring",
-            "create_stream_hash": "Alternate Data Stream",
-
-            # Endpoint/EDR
-            "endpoint": "Endpoint",
-            "behavior_event": "Behavior Detection",
-            "edr": "EDR",
-
-            # Network
-            "network": "Network Traffic",
-            "netflow": "NetFlow",
-            "packet": "Packet Capture",
-            "proxy": "Web Proxy",
-            "webproxy": "Web Proxy",
-            "firewall_logs": "Firewall",
-            "ids": "IDS/IPS",
-            "zeek": "Zeek",
-
-            # Cloud
-            "aws": "AWS CloudTrail",
-            "cloudtrail": "AWS CloudTrail",
-            "azure": "Azure Activity",
-            "gcp": "GCP Audit",
-            "cloud": "Cloud",
-            "o365": "Office 365",
-            "m365": "Microsoft 365",
-            "okta": "Okta",
-            "github": "GitHub",
-
-            # Linux/macOS
-            "linux_syslog": "Linux Syslog",
-            "linux": "Linux",
-            "auditd": "Linux Auditd",
-            "macos_logs": "macOS Logs",
-            "macos": "macOS",
-            "unix": "Unix/Linux",
-
-            # Email
-            "email": "Email",
-            "smtp": "SMTP",
-
-            # Authentication
-            "authentication": "Authentication",
-            "active_directory": "Active Directory",
-            "ldap": "LDAP",
-
-            # RMM specific
-            "rmm_tool": "RMM Tool",
-
-            # Web/Application
-            "application": "Application",
-            "webserver": "Web Server",
-            "antivirus": "Antivirus",
-        }
-
-        normalized = []
-        seen = set()
-
-        for source in raw_sources:
-            if not source:
-                continue
-
-            source_lower = source.lower().strip()
-
-            # Try exact match first
-            if source_lower in data_source_mapping:
-                mapped = data_source_mapping[source_lower]
-                if mapped not in seen:
-                    normalized.append(mapped)
-                    seen.add(mapped)
-                continue
-
-            # Try partial match
-            matched = False
-            for pattern, mapped in data_source_mapping.items():
-                if pattern in source_lower:
-                    if mapped not in seen:
-                        normalized.append(mapped)
-                        seen.add(mapped)
-                    matched = True
-                    break
-
-            # If no match, clean up and include as-is
-            if not matched:
-                # Capitalize words and replace underscores
-                clean = source.replace("_", " ").title()
-                if clean not in seen:
-                    normalized.append(clean)
-                    seen.add(clean)
-
-        return normalized
+        return list(_map_data_sources(tuple(raw_sources)))
@@ -1,10 +1,43 @@
 """Elastic detection rule normalizer."""
 
+from functools import lru_cache
 from typing import Any
 
 from app.normalizers.base import BaseNormalizer, NormalizedDetection
 from app.parsers.base import ParsedRule
 
+# Data source hints in Elastic index patterns: (substrings, raw data source)
+_INDEX_DATA_SOURCE_HINTS = (
+    (("sysmon",), "sysmon"),
+    (("security",), "security_event"),
+    (("powershell",), "powershell"),
+    (("endpoint",), "endpoint"),
+    (("winlogbeat",), "windows_event"),
+    (("auditbeat",), "auditd"),
+    (("filebeat",), "file_monitoring"),
+    (("packetbeat",), "network"),
+    (("aws", "cloudtrail"), "aws"),
+    (("azure",), "azure"),
+    (("gcp",), "gcp"),
+    (("o365", "office365"), "o365"),
+    (("okta",), "okta"),
+    (("github",), "github"),
+)
+
+
+@lru_cache(maxsize=1024)
+def _index_data_sources(index: str) -> tuple[str, ...]:
+    """Raw data source hints for one index pattern, in table order.
+
+    Rules share a small set of index patterns, so each one is scanned once.
+    """
+    index_lower = index.lower()
+    return tuple(
+        source
+        for keywords, source in _INDEX_DATA_SOURCE_HINTS
+        if any(keyword in index_lower for keyword in keywords)
+    )
+
 
 class ElasticNormalizer(BaseNormalizer):
     """Normalizer for Elastic detection rules."""
@@ -82,7 +115,8 @@ class ElasticNormalizer(BaseNormalizer):
             elif "logs-endpoint" in index_lower:
                 sources.append("endpoint")
 
-        return list(set(sources))
+        # Remove duplicates, keeping the order they were found in
+        return list(dict.fromkeys(sources))
 
     def _extract_data_sources(self, parsed: ParsedRule) -> list[str]:
         """Extract data sources from Elastic rule metadata."""
@@ -91,37 +125,7 @@ class ElasticNormalizer(BaseNormalizer):
         # Get index patterns and extract hints
         indices = parsed.extra.get("index", [])
         for index in indices:
-            index_lower = index.lower()
-
-            # Extract specific data source hints from index patterns
-            if "sysmon" in index_lower:
-                raw_sources.append("sysmon")
-            if "security" in index_lower:
-                raw_sources.append("security_event")
-            if "powershell" in index_lower:
-                raw_sources.append("powershell")
-            if "endpoint" in index_lower:
-                raw_sources.append("endpoint")
-            if "winlogbeat" in index_lower:
-                raw_sources.append("windows_event")
-            if "auditbeat" in index_lower:
-                raw_sources.append("auditd")
-            if "filebeat" in index_lower:
-                raw_sources.append("file_monitoring")
-            if "packetbeat" in index_lower:
-                raw_sources.append("network")
-            if "aws" in index_lower or "cloudtrail" in index_lower:
-                raw_sources.append("aws")
-            if "azure" in index_lower:
-                raw_sources.append("azure")
-            if "gcp" in index_lower:
-                raw_sources.append("gcp")
-            if "o365" in index_lower or "office365" in index_lower:
-                raw_sources.append("o365")
-            if "okta" in index_lower:
-                raw_sources.append("okta")
-            if "github" in index_lower:
-                raw_sources.append("github")
+            raw_sources.extend(_index_data_sources(index))
 
         # Also check log source product
         product = parsed.log_source.get("product", "")
@@ -72,7 +72,8 @@ class SplunkNormalizer(BaseNormalizer):
             if ds:
                 sources.append(ds.lower())
 
-        return list(set(sources))
+        # Remove duplicates, keeping the order they were found in
+        return list(dict.fromkeys(sources))
 
     def _extract_data_sources(self, parsed: ParsedRule) -> list[str]:
         """Extract data sources from Splunk rule."""
@@ -0,0 +1,238 @@
+"""In-process caching and request coalescing for read-heavy API responses."""
+
+import asyncio
+import time
+import weakref
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Awaitable, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Bumped whenever detections change; entries from older generations are stale
+_generation = 0
+
+
+def invalidate_caches() -> None:
+    """Invalidate every TTLCache (call after detections are written)."""
+    global _generation
+    _generation += 1
+
+
+class TTLCache:
+    """Small async memoization cache with per-entry expiry.
+
+    Entries expire after ``ttl`` seconds or as soon as ``invalidate_caches()``
+    is called. Concurrent misses for the same key are coalesced so the value
+    is only computed once.
+    """
+
+    def __init__(self, ttl: float):
+        """Initialize cache with time-to-live in seconds."""
+        self.ttl = ttl
+        self._entries: dict[Hashable, tuple[int, float, Any]] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (hit, value) for a key, dropping it if stale."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        generation, expires_at, value = entry
+        if generation != _generation or expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        return True, value
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached value for key, computing it with factory on a miss.
+
+        Args:
+            key: Hashable cache key
+            factory: Zero-argument coroutine function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have filled the entry while we waited
+            hit, value = self._lookup(key)
+            if hit:
+                return value
+
+            generation = _generation
+            value = await factory()
+            self._prune()
+            self._entries[key] = (generation, time.monotonic() + self.ttl, value)
+            return value
+
+    def _prune(self) -> None:
+        """Drop stale entries so keys that are never requested again don't pile up."""
+        now = time.monotonic()
+        stale = [
+            key
+            for key, (generation, expires_at, _) in self._entries.items()
+            if generation != _generation or expires_at <= now
+        ]
+        for key in stale:
+            del self._entries[key]
+            self._locks.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and their locks."""
+        self._entries.clear()
+        self._locks.clear()
+
+
+class SharedStream:
+    """Async byte stream produced once and fanned out to every subscriber.
+
+    Identical requests that subscribe before the stream's first chunk has
+    been dropped share one producer instead of each running their own query
+    and encoding. Chunks are dropped as soon as every subscriber has read
+    them, and the producer waits while ``max_buffered`` chunks are pending,
+    so a slow client holds back the query rather than the whole export
+    piling up in memory. The producer is cancelled if every subscriber goes
+    away before it ends.
+    """
+
+    def __init__(
+        self,
+        source: AsyncGenerator[bytes, None],
+        on_done: Optional[Callable[[], None]] = None,
+        max_buffered: int = 8,
+    ):
+        """Start producing from source; on_done runs once it is exhausted."""
+        self._chunks: list[bytes] = []  # Chunks some subscriber has yet to read
+        self._offset = 0  # Stream position of self._chunks[0]
+        self._subscribers: weakref.WeakSet[_Subscription] = weakref.WeakSet()
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._max_buffered = max_buffered
+        self._produced = asyncio.Event()
+        self._consumed = asyncio.Event()
+        self._on_done = on_done
+        self._task = asyncio.create_task(self._produce(source))
+
+    async def _produce(self, source: AsyncGenerator[bytes, None]) -> None:
+        """Pull chunks from source as subscribers make room for them."""
+        try:
+            async with aclosing(source):
+                async for chunk in source:
+                    self._chunks.append(chunk)
+                    self._produced.set()
+                    # Backpressure: wait for the slowest subscriber to catch up
+                    while len(self._chunks) >= self._max_buffered:
+                        self._consumed.clear()
+                        await self._consumed.wait()
+        except Exception as e:
+            self._error = e
+        except asyncio.CancelledError as e:
+            # Subscribers that haven't finished reading must not mistake
+            # the cut-off stream for a complete one
+            self._error = e
+            raise
+        finally:
+            self._done = True
+            self._produced.set()
+            if self._on_done is not None:
+                self._on_done()
+
+    async def has_data(self) -> bool:
+        """Wait for the first chunk; False if the source produced nothing.
+
+        Raises:
+            Exception: Whatever the source raised before its first chunk
+        """
+        while not (self._chunks or self._offset or self._done):
+            self._produced.clear()
+            await self._produced.wait()
+        has_data = bool(self._chunks or self._offset)
+        if not has_data and self._error is not None:
+            raise self._error
+        return has_data
+
+    def subscribe(self) -> Optional["_Subscription"]:
+        """Subscribe to the stream from its first chunk.
+
+        The subscriber counts from this call, before it reads anything, so
+        the producer keeps running for it. Returns None once the first chunk
+        has been dropped and the stream can no longer be replayed from the
+        start.
+        """
+        if self._offset:
+            return None
+        subscription = _Subscription(self)
+        self._subscribers.add(subscription)
+        return subscription
+
+    async def _next(self, subscription: "_Subscription") -> bytes:
+        """Return a subscriber's next chunk, waiting for the producer if needed."""
+        while True:
+            index = subscription.position - self._offset
+            if index < len(self._chunks):
+                subscription.position += 1
+                chunk = self._chunks[index]
+                self._trim()
+                return chunk
+            if self._done:
+                subscription.close()
+                if self._error is not None:
+                    raise RuntimeError("Shared stream source failed") from self._error
+                raise StopAsyncIteration
+            self._produced.clear()
+            await self._produced.wait()
+
+    def _leave(self, subscription: "_Subscription") -> None:
+        """Remove a subscriber, cancelling the producer if it was the last."""
+        self._subscribers.discard(subscription)
+        self._trim()
+        if not self._subscribers and not self._done:
+            self._task.cancel()
+
+    def _trim(self) -> None:
+        """Drop chunks every subscriber has read and wake a waiting producer."""
+        end = self._offset + len(self._chunks)
+        read = min((s.position for s in self._subscribers), default=end)
+        if read > self._offset:
+            del self._chunks[:read - self._offset]
+            self._offset = read
+            self._consumed.set()
+
+
+class _Subscription:
+    """One subscriber's read position in a SharedStream, as an async iterator.
+
+    Leaves the stream when exhausted, closed or garbage collected, so a
+    response dropped before it starts reading doesn't stall the producer.
+    """
+
+    def __init__(self, stream: SharedStream):
+        self._stream = stream
+        self._active = True
+        self.position = 0
+
+    def __aiter__(self) -> "_Subscription":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if not self._active:
+            raise StopAsyncIteration
+        return await self._stream._next(self)
+
+    async def aclose(self) -> None:
+        """Stop reading (async iterator protocol)."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop reading and release the subscriber's hold on the stream."""
+        if self._active:
+            self._active = False
+            self._stream._leave(self)
+
+    def __del__(self) -> None:
+        self.close()
@@ -6,7 +6,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -22,7 +22,9 @@ from app.normalizers import (
     SublimeNormalizer, ElasticProtectionsNormalizer, LOLRMMNormalizer,
     ElasticHuntingNormalizer, SentinelNormalizer, BaseNormalizer, NormalizedDetection
 )
+from app.services.cache import invalidate_caches
 from app.services.rule_discovery import RuleDiscoveryService
+from app.services.search import SearchService
 from app.services.ingestion_errors import (
     IngestionStats, ErrorStage, ErrorSeverity
 )
@@ -86,7 +88,7 @@ class IngestionService:
         await self._clear_repository_rules(repo_name)
 
         # Discover and process rules
-        rules_to_store: list[Detection] = []
+        rules_to_store: list[dict] = []
         batch_size = 100
 
         for relative_path in self.discovery.discover_rules(repo_name):
@@ -136,9 +138,8 @@ class IngestionService:
                 normalized = normalizer.normalize(parsed)
                 stats.normalized += 1
 
-                # Convert to database model
-                detection = self._to_detection_model(normalized)
-                rules_to_store.append(detection)
+                # Convert to a detections row
+                rules_to_store.append(self._to_detection_row(normalized))
 
                 # Batch insert
                 if len(rules_to_store) >= batch_size:
@@ -160,9 +161,15 @@ class IngestionService:
             stored_count = await self._store_rules_safe(rules_to_store, stats)
             stats.stored += stored_count
 
+        # Rebuild precomputed technique coverage for this source
+        await self._refresh_precomputed_counts(repo_name)
+
         # Update repository rule count
         await self._update_repository_count(repo_name, stats.stored)
 
+        # Cached aggregates over detections are now stale
+        invalidate_caches()
+
         stats.end_time = datetime.utcnow()
 
         logger.info(
@@ -180,53 +187,56 @@ class IngestionService:
         await self.db.execute(
             delete(Detection).where(Detection.source == repo_name)
         )
-        await self.db.commit()
+        await self._refresh_precomputed_counts(repo_name)
+        invalidate_caches()
 
     async def _store_rules_safe(
         self,
-        rules: list[Detection],
+        rules: list[dict],
         stats: IngestionStats
     ) -> int:
         """Store a batch of rules to the database with error handling.
 
+        The batch is written with one bulk INSERT rather than through the
+        unit of work; if that fails, rules are retried one at a time so a
+        single bad row doesn't lose the rest of the batch.
+
         Returns the number of rules successfully stored.
         """
+        try:
+            await self.db.execute(insert(Detection), rules)
+            await self.db.commit()
+            return len(rules)
+        except Exception as e:
+            logger.error(f"Batch commit failed: {e}")
+            await self.db.rollback()
+
+        # Try to store rules one by one
         stored = 0
         for rule in rules:
             try:
-                self.db.add(rule)
+                await self.db.execute(insert(Detection), [rule])
+                await self.db.commit()
                 stored += 1
-            except Exception as e:
+            except Exception as inner_e:
+                await self.db.rollback()
                 stats.add_error(
-                    file_path=rule.source_file,
+                    file_path=rule["source_file"],
                     stage=ErrorStage.STORE,
-                    message=f"Database error: {type(e).__name__}: {str(e)}",
+                    message=f"Individual store failed: {type(inner_e).__name__}: {str(inner_e)}",
                     severity=ErrorSeverity.ERROR
                 )
 
-        try:
-            await self.db.commit()
-        except Exception as e:
-            logger.error(f"Batch commit failed: {e}")
-            await self.db.rollback()
-            # Try to store rules one by one
-            stored = 0
-            for rule in rules:
-                try:
-                    self.db.add(rule)
-                    await self.db.commit()
-                    stored += 1
-                except Exception as inner_e:
-                    await self.db.rollback()
-                    stats.add_error(
-                        file_path=rule.source_file,
-                        stage=ErrorStage.STORE,
-                        message=f"Individual store failed: {type(inner_e).__name__}: {str(inner_e)}",
-                        severity=ErrorSeverity.ERROR
-                    )
-
         return stored
 
+    async def _refresh_precomputed_counts(self, repo_name: str) -> None:
+        """Rebuild the technique coverage, trending rows and daily counts for a repository."""
+        search_service = SearchService(self.db)
+        await search_service.refresh_technique_counts(repo_name)
+        await search_service.refresh_detection_techniques(repo_name)
+        await search_service.refresh_daily_counts(repo_name)
+        await self.db.commit()
+
     async def _update_repository_count(self, repo_name: str, count: int) -> None:
         """Update the rule count for a repository."""
         result = await self.db.execute(
@@ -237,9 +247,9 @@ class IngestionService:
             repo.rule_count = count
             await self.db.commit()
 
-    def _to_detection_model(self, normalized: NormalizedDetection) -> Detection:
-        """Convert normalized detection to database model."""
-        return Detection(
+    def _to_detection_row(self, normalized: NormalizedDetection) -> dict:
+        """Convert a normalized detection to a row of detection column values."""
+        return dict(
             id=normalized.id,
             source=normalized.source,
             source_file=normalized.source_file,
@@ -267,20 +277,20 @@ class IngestionService:
             raw_content=normalized.raw_content,
             rule_created_date=normalized.rule_created_date,
             rule_modified_date=normalized.rule_modified_date,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
         )
 
     async def get_ingestion_stats(self) -> dict:
         """Get overall ingestion statistics."""
-        stats = {}
-
-        # Count detections per source
-        for source in ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm", "elastic_hunting"]:
-            result = await self.db.execute(
-                select(Detection).where(Detection.source == source)
-            )
-            stats[source] = len(result.scalars().all())
+        sources = ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm", "elastic_hunting"]
+
+        # Count detections per source in the database rather than loading them
+        result = await self.db.execute(
+            select(Detection.source, func.count())
+            .where(Detection.source.in_(sources))
+            .group_by(Detection.source)
+        )
+        stats = dict.fromkeys(sources, 0)
+        stats.update(result.all())
 
         stats["total"] = sum(stats.values())
         return stats
@@ -1,5 +1,6 @@
 """MITRE ATT&CK data service - fetches and caches data from official MITRE CTI repository."""
 
+import hashlib
 import json
 import logging
 from datetime import datetime, timedelta
@@ -7,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +81,13 @@ class MitreAttackService:
     def __init__(self):
         self._tactics: dict[str, dict] = {}
         self._techniques: dict[str, dict] = {}
+        # Active techniques per tactic, sorted parents first then by ID
+        self._techniques_by_tactic: dict[str, list[tuple[str, dict]]] = {}
+        self._parent_techniques_by_tactic: dict[str, list[tuple[str, dict]]] = {}
+        # Memoized map_technique() results, reset whenever techniques reload
+        self._mapped_techniques: dict[str, Optional[str]] = {}
+        # Digest of the loaded tactics and techniques, recomputed on reload
+        self._content_hash = ""
         self._last_fetch: Optional[datetime] = None
         self._loaded = False
 
@@ -118,6 +127,7 @@ class MitreAttackService:
 
             self._tactics = data.get("tactics", {})
             self._techniques = data.get("techniques", {})
+            self._index_techniques()
             self._last_fetch = file_mtime
             logger.info(f"Loaded MITRE data from cache: {len(self._tactics)} tactics, {len(self._techniques)} techniques")
             return True
@@ -235,6 +245,7 @@ class MitreAttackService:
 
         self._tactics = tactics
         self._techniques = techniques
+        self._index_techniques()
 
     def _load_fallback_data(self) -> None:
         """Load minimal fallback data if fetch fails and no cache exists."""
@@ -256,8 +267,39 @@ class MitreAttackService:
             "TA0040": {"id": "TA0040", "name": "Impact", "short_name": "impact", "url": "https://attack.mitre.org/tactics/TA0040/", "deprecated": False},
         }
         self._techniques = {}
+        self._index_techniques()
         self._loaded = True
 
+    def _index_techniques(self) -> None:
+        """Index active (non-deprecated, non-revoked) techniques by tactic."""
+        by_tactic: dict[str, list[tuple[str, dict]]] = {}
+        for tech_id, tech_info in self._techniques.items():
+            if tech_info.get("deprecated") or tech_info.get("revoked"):
+                continue
+            for tactic_id in tech_info.get("tactics", []):
+                by_tactic.setdefault(tactic_id, []).append((tech_id, tech_info))
+
+        for entries in by_tactic.values():
+            entries.sort(key=lambda e: (bool(e[1].get("is_subtechnique")), e[0]))
+
+        self._techniques_by_tactic = by_tactic
+        self._parent_techniques_by_tactic = {
+            tactic_id: [e for e in entries if not e[1].get("is_subtechnique")]
+            for tactic_id, entries in by_tactic.items()
+        }
+        self._mapped_techniques = {}
+        self._content_hash = hashlib.blake2b(
+            orjson.dumps([self._tactics, self._techniques], option=orjson.OPT_SORT_KEYS),
+            digest_size=16,
+        ).hexdigest()
+
+    @property
+    def etag(self) -> str:
+        """HTTP entity tag for the loaded data; changes whenever it is reloaded."""
+        last_fetch = self._last_fetch.isoformat() if self._last_fetch else ""
+        version = f"{self._content_hash}:{last_fetch}:{self._loaded}"
+        return '"' + hashlib.blake2b(version.encode(), digest_size=16).hexdigest() + '"'
+
     def get_tactic(self, tactic_id: str) -> Optional[dict]:
         """Get tactic info by ID."""
         return self._tactics.get(tactic_id)
@@ -284,6 +326,19 @@ class MitreAttackService:
         """Get all techniques."""
         return self._techniques
 
+    def get_techniques_for_tactic(
+        self,
+        tactic_id: str,
+        include_subtechniques: bool = True,
+    ) -> list[tuple[str, dict]]:
+        """Get active techniques for a tactic as (technique_id, info) pairs.
+
+        Parent techniques come first, then sub-techniques, each sorted by ID.
+        """
+        if include_subtechniques:
+            return self._techniques_by_tactic.get(tactic_id, [])
+        return self._parent_techniques_by_tactic.get(tactic_id, [])
+
     def get_stats(self) -> dict:
         """Get stats about loaded MITRE data."""
         return {
@@ -306,7 +361,17 @@ class MitreAttackService:
 
         Returns the mapped technique ID if deprecated/revoked,
         the original ID if valid, or None if invalid and unmapped.
+        Results are memoized until the technique data is reloaded.
         """
+        try:
+            return self._mapped_techniques[technique_id]
+        except KeyError:
+            mapped_id = self._map_technique_uncached(technique_id)
+            self._mapped_techniques[technique_id] = mapped_id
+            return mapped_id
+
+    def _map_technique_uncached(self, technique_id: str) -> Optional[str]:
+        """Resolve a technique ID without consulting the memo."""
         # Check if it's already a valid technique
         if self.is_valid_technique(technique_id):
             return technique_id
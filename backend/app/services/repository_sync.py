@@ -1,5 +1,6 @@
 """Repository synchronization service."""
 
+import asyncio
 import logging
 import subprocess
 from datetime import datetime
@@ -100,6 +101,11 @@ class RepositorySyncService:
         await self.db.refresh(repo)
         return repo
 
+    async def ensure_all_repositories(self) -> None:
+        """Ensure metadata exists for every configured repository."""
+        for name in self.REPO_CONFIGS:
+            await self.ensure_repository_exists(name)
+
     async def sync_repository(self, name: str) -> tuple[bool, str]:
         """Synchronize a repository from GitHub.
 
@@ -127,7 +133,7 @@ class RepositorySyncService:
                 # This is more reliable than trying to pull shallow clones
                 import shutil
                 logger.info(f"Removing existing repo at {repo_path} for fresh clone")
-                shutil.rmtree(repo_path)
+                await asyncio.to_thread(shutil.rmtree, repo_path)
 
             # Clone repository (fresh clone ensures we have latest)
             # Use sparse checkout for large repos like sentinel
@@ -178,8 +184,9 @@ class RepositorySyncService:
         logger.info(f"Cloning {url} to {path}")
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Clone with depth=1 for faster initial clone
-        repo = Repo.clone_from(url, path, depth=1)
+        # Clone with depth=1 for faster initial clone; git runs in a worker
+        # thread so concurrent syncs don't block the event loop
+        repo = await asyncio.to_thread(Repo.clone_from, url, path, depth=1)
         return repo.head.commit.hexsha
 
     async def _sparse_clone_repository(
@@ -196,6 +203,12 @@ class RepositorySyncService:
             Current commit hash
         """
         logger.info(f"Sparse cloning {url} to {path} with patterns: {patterns}")
+        # git runs in a worker thread so concurrent syncs don't block the event loop
+        return await asyncio.to_thread(self._sparse_clone_blocking, url, path, patterns)
+
+    @staticmethod
+    def _sparse_clone_blocking(url: str, path: Path, patterns: list[str]) -> str:
+        """Run the blocking git commands for a sparse clone."""
         path.mkdir(parents=True, exist_ok=True)
 
         # Initialize empty repo
@@ -2,12 +2,11 @@
 
 import asyncio
 import logging
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import select, desc
+from sqlalchemy import Row, select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -16,6 +15,9 @@ from app.models.sync_job import SyncJob
 from app.services.repository_sync import RepositorySyncService
 from app.services.ingestion import IngestionService
 
+if TYPE_CHECKING:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
 logger = logging.getLogger(__name__)
 
 ALL_REPOSITORIES = ["sigma", "elastic", "splunk", "sublime", "elastic_protections", "lolrmm"]
@@ -25,7 +27,7 @@ class SchedulerService:
     """Service for managing scheduled sync and ingestion jobs."""
 
     _instance: Optional["SchedulerService"] = None
-    _scheduler: Optional[AsyncIOScheduler] = None
+    _scheduler: Optional["AsyncIOScheduler"] = None
     _is_running: bool = False
 
     def __new__(cls):
@@ -34,14 +36,16 @@ class SchedulerService:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        """Initialize the scheduler."""
-        if self._scheduler is None:
-            self._scheduler = AsyncIOScheduler()
-            self._setup_jobs()
-
     def _setup_jobs(self):
-        """Set up scheduled jobs."""
+        """Create the APScheduler instance and its scheduled jobs.
+
+        APScheduler is imported here rather than at module level so that
+        deployments with the scheduler disabled never load it.
+        """
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        from apscheduler.triggers.cron import CronTrigger
+
+        self._scheduler = AsyncIOScheduler()
         # Daily full sync at configured time (default 2 AM UTC)
         self._scheduler.add_job(
             self._run_full_sync,
@@ -60,6 +64,8 @@ class SchedulerService:
     def start(self):
         """Start the scheduler."""
         if not self._is_running:
+            if self._scheduler is None:
+                self._setup_jobs()
             self._scheduler.start()
             self._is_running = True
             logger.info("Scheduler started")
@@ -77,7 +83,9 @@ class SchedulerService:
         return self._is_running
 
     def get_next_run_time(self) -> Optional[datetime]:
-        """Get the next scheduled run time."""
+        """Get the next scheduled run time (None until the scheduler is started)."""
+        if not self._is_running:
+            return None
         job = self._scheduler.get_job("daily_full_sync")
         if job:
             return job.next_run_time
@@ -92,31 +100,37 @@ class SchedulerService:
         self,
         triggered_by: str = "manual",
         repository: Optional[str] = None,
+        job_id: Optional[str] = None,
     ) -> SyncJob:
         """Run a full sync and ingestion job.
 
         Args:
             triggered_by: How the job was triggered ("manual", "scheduled", "webhook")
             repository: Specific repository to sync, or None for all
+            job_id: ID of a pending job record the caller already created, so
+                it could hand out the ID before the job starts; a new record
+                is created if not given
 
         Returns:
             The SyncJob record with results
         """
         async with async_session_maker() as db:
-            # Create job record
-            job = SyncJob(
-                job_type="full",
-                repository=repository,
-                triggered_by=triggered_by,
-                status="running",
-                started_at=datetime.utcnow(),
-            )
-            db.add(job)
+            job = await db.get(SyncJob, job_id) if job_id else None
+            if job is None:
+                # Create job record
+                job = SyncJob(
+                    id=job_id or str(uuid.uuid4()),
+                    job_type="full",
+                    repository=repository,
+                    triggered_by=triggered_by,
+                )
+                db.add(job)
+            job.status = "running"
+            job.started_at = datetime.utcnow()
             await db.commit()
-            await db.refresh(job)
 
             job_id = job.id
-            logger.info(f"Created sync job {job_id}")
+            logger.info(f"Started sync job {job_id}")
 
             try:
                 repos_to_sync = [repository] if repository else ALL_REPOSITORIES
@@ -216,18 +230,25 @@ async def get_sync_job_history(
     db: AsyncSession,
     limit: int = 20,
     repository: Optional[str] = None,
-) -> list[SyncJob]:
+) -> list[Row]:
     """Get recent sync job history.
 
+    Selects the job columns directly rather than loading SyncJob objects,
+    since the history is only ever read and serialized.
+
     Args:
         db: Database session
         limit: Maximum number of jobs to return
         repository: Filter by repository name
 
     Returns:
-        List of SyncJob records
+        List of rows with every SyncJob column, newest first
     """
-    query = select(SyncJob).order_by(desc(SyncJob.created_at)).limit(limit)
+    query = (
+        select(*SyncJob.__table__.columns)
+        .order_by(desc(SyncJob.created_at))
+        .limit(limit)
+    )
 
     if repository:
         query = query.where(
@@ -235,7 +256,7 @@ async def get_sync_job_history(
         )
 
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return list(result.all())
 
 
 async def get_last_successful_sync(
@@ -1,16 +1,58 @@
 """Search and filter service for detection rules."""
 
 import logging
+import uuid
 from dataclasses import dataclass, field
-from typing import Optional
+from datetime import date
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import select, or_, and_, func, cast, String
+from sqlalchemy import Row, select, type_coerce, or_, and_, func, cast, case, literal, union_all, String, true, delete, insert, exists
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.models.detection import Detection
+from app.models.daily_count import DailyDetectionCount
+from app.models.detection_technique import DetectionTechnique
+from app.models.technique_count import TechniqueCount
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming results
+STREAM_BATCH_SIZE = 500
+
+# Columns needed by list views; leaves out the large raw_content blob
+LIST_VIEW_COLUMNS = tuple(
+    column for column in Detection.__table__.columns if column.name != "raw_content"
+)
+
+
+def json_array_elements(column, dialect_name: str):
+    """Expand a JSON array column into a table of its elements.
+
+    SQLite exposes this as ``json_each()`` and PostgreSQL (where list
+    columns are jsonb) as ``jsonb_array_elements_text()``; both yield a
+    ``value`` column and may be joined against the owning table with
+    ``ON true``.
+    """
+    if dialect_name == "postgresql":
+        elements = func.jsonb_array_elements_text(column)
+    else:
+        elements = func.json_each(column)
+    return elements.table_valued("value").alias("elem")
+
+
+def technique_contains(column, technique: str, dialect_name: str):
+    """Match rows whose JSON technique array contains the given technique.
+
+    On PostgreSQL this is a jsonb ``@>`` containment test, which can use the
+    ``ix_detections_mitre_techniques_gin`` index. Other databases fall back to
+    a case-insensitive text match on the serialized array.
+    """
+    if dialect_name == "postgresql":
+        return type_coerce(column, JSONB).contains([technique.upper()])
+    return cast(column, String).ilike(f'%"{technique}"%')
+
 
 @dataclass
 class SearchFilters:
@@ -56,17 +98,25 @@ class SearchService:
         """Initialize search service with database session."""
         self.db = db
 
-    async def search_detections(self, filters: SearchFilters) -> tuple[list[Detection], int]:
+    @property
+    def dialect_name(self) -> str:
+        """Name of the SQL dialect backing the current session."""
+        return self.db.get_bind().dialect.name
+
+    async def search_detections(self, filters: SearchFilters) -> tuple[list[Row], int]:
         """Search for detections with filters.
 
+        Only the list-view columns are selected, so pages of results don't
+        carry each rule's raw content.
+
         Args:
             filters: Search and filter parameters
 
         Returns:
-            Tuple of (detections list, total count)
+            Tuple of (detection rows, total count)
         """
         # Build base query
-        query = select(Detection)
+        query = select(*LIST_VIEW_COLUMNS)
         count_query = select(func.count(Detection.id))
 
         # Apply filters
@@ -87,10 +137,45 @@ class SearchService:
 
         # Execute query
         result = await self.db.execute(query)
-        detections = list(result.scalars().all())
+        detections = list(result.all())
 
         return detections, total_count
 
+    async def stream_detections(
+        self,
+        filters: SearchFilters,
+        include_raw: bool = True,
+    ) -> AsyncIterator[Detection]:
+        """Stream all detections matching filters, ignoring pagination.
+
+        Rows are fetched through a server-side cursor in batches, so large
+        exports never hold the full result set in memory. Detection has no
+        relationships (list fields are JSON columns loaded with the row), so
+        each batch is a single query.
+
+        Args:
+            filters: Search and filter parameters (offset/limit are ignored)
+            include_raw: Whether to load raw_content (otherwise it stays
+                deferred and is never fetched)
+
+        Yields:
+            Matching detections in the requested sort order
+        """
+        query = select(Detection)
+        if include_raw:
+            query = query.options(undefer(Detection.raw_content))
+
+        conditions = self._build_conditions(filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = self._apply_sorting(query, filters.sort_by, filters.sort_order)
+        query = query.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+        result = await self.db.stream_scalars(query)
+        async for detection in result:
+            yield detection
+
     async def get_detection_by_id(self, detection_id: str) -> Optional[Detection]:
         """Get a single detection by ID.
 
@@ -100,29 +185,83 @@ class SearchService:
         Returns:
             Detection or None if not found
         """
+        ids = self._usable_ids([detection_id])
+        if not ids:
+            return None
+
         result = await self.db.execute(
-            select(Detection).where(Detection.id == detection_id)
+            select(Detection)
+            .where(Detection.id == ids[0])
+            .options(undefer(Detection.raw_content))
         )
         return result.scalar_one_or_none()
 
-    async def get_detections_by_ids(self, detection_ids: list[str]) -> list[Detection]:
+    async def get_detections_by_ids(
+        self,
+        detection_ids: list[str],
+        include_raw: bool = True,
+    ) -> list[Detection]:
         """Get multiple detections by their IDs.
 
         Args:
             detection_ids: List of detection UUIDs
+            include_raw: Whether to load raw_content
 
         Returns:
             List of detections (in the order requested, if found)
         """
+        detection_ids = self._usable_ids(detection_ids)
+        if not detection_ids:
+            return []
+
+        query = select(Detection).where(Detection.id.in_(detection_ids))
+        if include_raw:
+            query = query.options(undefer(Detection.raw_content))
+
+        result = await self.db.execute(query)
+        return self._in_requested_order(result.scalars().all(), detection_ids)
+
+    async def get_detections_for_side_by_side(self, detection_ids: list[str]) -> list[Detection]:
+        """Get detections by ID without loading raw_content.
+
+        raw_content stays deferred with raiseload, so any accidental access
+        fails loudly instead of issuing one lazy load per detection.
+
+        Args:
+            detection_ids: List of detection UUIDs
+
+        Returns:
+            List of detections (in the order requested, if found)
+        """
+        detection_ids = self._usable_ids(detection_ids)
         if not detection_ids:
             return []
 
         result = await self.db.execute(
             select(Detection).where(Detection.id.in_(detection_ids))
         )
-        detections = list(result.scalars().all())
+        return self._in_requested_order(result.scalars().all(), detection_ids)
 
-        # Preserve the requested order
+    def _usable_ids(self, detection_ids: list[str]) -> list[str]:
+        """Prepare requested detection IDs for an id lookup.
+
+        On PostgreSQL the id column is a native uuid, which rejects
+        malformed values outright instead of matching nothing, so those are
+        dropped and the rest normalized to the text form it returns.
+        """
+        if self.dialect_name != "postgresql":
+            return detection_ids
+        ids = []
+        for detection_id in detection_ids:
+            try:
+                ids.append(str(uuid.UUID(detection_id)))
+            except (ValueError, TypeError, AttributeError):
+                continue
+        return ids
+
+    @staticmethod
+    def _in_requested_order(detections, detection_ids: list[str]) -> list[Detection]:
+        """Order detections to match the requested IDs, skipping missing ones."""
         id_to_detection = {d.id: d for d in detections}
         return [id_to_detection[id] for id in detection_ids if id in id_to_detection]
 
@@ -130,7 +269,7 @@ class SearchService:
         self,
         technique: str,
         sources: Optional[list[str]] = None,
-    ) -> dict[str, list[Detection]]:
+    ) -> dict[str, list[Row]]:
         """Get detections for a technique, grouped by source.
 
         Args:
@@ -138,33 +277,22 @@ class SearchService:
             sources: Optional list of sources to include
 
         Returns:
-            Dict mapping source name to list of detections
+            Dict mapping source name to list of detection rows (list-view columns)
         """
-        # Use text-based matching for cross-database compatibility (SQLite + PostgreSQL)
-        query = select(Detection).where(
-            cast(Detection.mitre_techniques, String).ilike(f'%"{technique}"%')
+        query = select(*LIST_VIEW_COLUMNS).where(
+            technique_contains(Detection.mitre_techniques, technique, self.dialect_name)
         )
 
         if sources:
             query = query.where(Detection.source.in_(sources))
 
-        result = await self.db.execute(query)
-        detections = result.scalars().all()
-
-        # Group by source
-        grouped: dict[str, list[Detection]] = {}
-        for detection in detections:
-            if detection.source not in grouped:
-                grouped[detection.source] = []
-            grouped[detection.source].append(detection)
-
-        return grouped
+        return await self._fetch_grouped_by_source(query)
 
     async def compare_by_keyword(
         self,
         keyword: str,
         sources: Optional[list[str]] = None,
-    ) -> dict[str, list[Detection]]:
+    ) -> dict[str, list[Row]]:
         """Get detections containing a keyword in detection logic.
 
         Args:
@@ -172,9 +300,9 @@ class SearchService:
             sources: Optional list of sources to include
 
         Returns:
-            Dict mapping source name to list of detections
+            Dict mapping source name to list of detection rows (list-view columns)
         """
-        query = select(Detection).where(
+        query = select(*LIST_VIEW_COLUMNS).where(
             or_(
                 Detection.detection_logic.ilike(f"%{keyword}%"),
                 Detection.raw_content.ilike(f"%{keyword}%"),
@@ -184,23 +312,13 @@ class SearchService:
         if sources:
             query = query.where(Detection.source.in_(sources))
 
-        result = await self.db.execute(query)
-        detections = result.scalars().all()
-
-        # Group by source
-        grouped: dict[str, list[Detection]] = {}
-        for detection in detections:
-            if detection.source not in grouped:
-                grouped[detection.source] = []
-            grouped[detection.source].append(detection)
-
-        return grouped
+        return await self._fetch_grouped_by_source(query)
 
     async def compare_by_platform(
         self,
         platform: str,
         sources: Optional[list[str]] = None,
-    ) -> dict[str, list[Detection]]:
+    ) -> dict[str, list[Row]]:
         """Get detections for a specific platform, grouped by source.
 
         Args:
@@ -208,22 +326,200 @@ class SearchService:
             sources: Optional list of sources to include
 
         Returns:
-            Dict mapping source name to list of detections
+            Dict mapping source name to list of detection rows (list-view columns)
         """
-        query = select(Detection).where(Detection.platform == platform.lower())
+        query = select(*LIST_VIEW_COLUMNS).where(Detection.platform == platform.lower())
 
         if sources:
             query = query.where(Detection.source.in_(sources))
 
+        return await self._fetch_grouped_by_source(query)
+
+    async def refresh_technique_counts(self, source: Optional[str] = None) -> None:
+        """Rebuild the precomputed (source, technique) counts.
+
+        The technique arrays are expanded and grouped in the database and the
+        result replaces the existing rows. The caller is responsible for
+        committing.
+
+        Args:
+            source: Only rebuild counts for this source (all sources if None)
+        """
+        elem = json_array_elements(Detection.mitre_techniques, self.dialect_name)
+        counts = (
+            select(Detection.source, elem.c.value, func.count())
+            .select_from(Detection)
+            .join(elem, true())
+            .where(elem.c.value.isnot(None))
+            .group_by(Detection.source, elem.c.value)
+        )
+        clear = delete(TechniqueCount)
+
+        if source:
+            counts = counts.where(Detection.source == source)
+            clear = clear.where(TechniqueCount.source == source)
+
+        await self.db.execute(clear)
+        await self.db.execute(
+            insert(TechniqueCount).from_select(
+                ["source", "technique_id", "detection_count"], counts
+            )
+        )
+
+    async def refresh_detection_techniques(self, source: Optional[str] = None) -> None:
+        """Rebuild the expanded (detection, technique) rows used by trending.
+
+        Only detections with a rule_modified_date are expanded. The caller
+        is responsible for committing.
+
+        Args:
+            source: Only rebuild rows for this source (all sources if None)
+        """
+        elem = json_array_elements(Detection.mitre_techniques, self.dialect_name)
+        rows = (
+            select(Detection.id, elem.c.value, Detection.source, Detection.rule_modified_date)
+            .select_from(Detection)
+            .join(elem, true())
+            .where(
+                and_(
+                    Detection.rule_modified_date.isnot(None),
+                    elem.c.value.isnot(None),
+                )
+            )
+            .distinct()
+        )
+        clear = delete(DetectionTechnique)
+
+        if source:
+            rows = rows.where(Detection.source == source)
+            clear = clear.where(DetectionTechnique.source == source)
+
+        await self.db.execute(clear)
+        await self.db.execute(
+            insert(DetectionTechnique).from_select(
+                ["detection_id", "technique_id", "source", "rule_modified_date"], rows
+            )
+        )
+
+    async def refresh_daily_counts(self, source: Optional[str] = None) -> None:
+        """Rebuild the precomputed (source, day) counts of modified rules.
+
+        Detections are bucketed by the calendar day of rule_modified_date in
+        the database and the result replaces the existing rows. The caller
+        is responsible for committing.
+
+        Args:
+            source: Only rebuild counts for this source (all sources if None)
+        """
+        day = func.date(Detection.rule_modified_date)
+        counts = (
+            select(Detection.source, day, func.count())
+            .where(Detection.rule_modified_date.isnot(None))
+            .group_by(Detection.source, day)
+        )
+        clear = delete(DailyDetectionCount)
+
+        if source:
+            counts = counts.where(Detection.source == source)
+            clear = clear.where(DailyDetectionCount.source == source)
+
+        await self.db.execute(clear)
+        await self.db.execute(
+            insert(DailyDetectionCount).from_select(
+                ["source", "day", "detection_count"], counts
+            )
+        )
+
+    async def precomputed_counts_stale(self) -> bool:
+        """Check whether the precomputed tables are out of step with detections.
+
+        Ingestion keeps them in sync, so this only uses cheap aggregates to
+        catch databases created before a table existed (or left half-built):
+        the daily counts must add up to the number of dated detections, and
+        the technique tables must be non-empty when there are detections.
+        """
+        total, dated = (
+            await self.db.execute(select(func.count(), func.count(Detection.rule_modified_date)))
+        ).one()
+        daily_total = await self.db.scalar(
+            select(func.coalesce(func.sum(DailyDetectionCount.detection_count), 0))
+        )
+        if daily_total != dated:
+            return True
+
+        has_technique_counts = await self.db.scalar(select(exists().select_from(TechniqueCount)))
+        has_detection_techniques = await self.db.scalar(select(exists().select_from(DetectionTechnique)))
+        return has_technique_counts != bool(total) or has_detection_techniques != bool(dated)
+
+    async def count_modified_by_source(self, since: date) -> dict[str, int]:
+        """Count detections modified on or after a day, per source.
+
+        Reads the precomputed counts maintained by refresh_daily_counts().
+
+        Args:
+            since: First day to include
+
+        Returns:
+            Mapping of source to count, for sources with at least one rule
+        """
+        result = await self.db.execute(
+            select(DailyDetectionCount.source, func.sum(DailyDetectionCount.detection_count))
+            .where(DailyDetectionCount.day >= since)
+            .group_by(DailyDetectionCount.source)
+            .order_by(DailyDetectionCount.source)
+        )
+        return {source: int(count) for source, count in result}
+
+    async def count_techniques_by_source(self) -> list[tuple[str, str, int]]:
+        """Count detections per (source, technique) pair.
+
+        Reads the precomputed counts maintained by refresh_technique_counts().
+
+        Returns:
+            List of (source, technique_id, count) tuples
+        """
+        result = await self.db.execute(
+            select(
+                TechniqueCount.source,
+                TechniqueCount.technique_id,
+                TechniqueCount.detection_count,
+            )
+        )
+        return list(result.all())
+
+    async def diff_techniques(self, base_source: str, compare_source: str) -> list[tuple[str, bool, bool]]:
+        """Compare the techniques covered by two sources in one query.
+
+        Args:
+            base_source: Source used as the baseline
+            compare_source: Source compared against the baseline
+
+        Returns:
+            Sorted list of (technique_id, in_base, in_compare) tuples covering
+            every technique referenced by either source
+        """
+        in_base = func.max(case((TechniqueCount.source == base_source, 1), else_=0))
+        in_compare = func.max(case((TechniqueCount.source == compare_source, 1), else_=0))
+
+        order_by = TechniqueCount.technique_id
+        if self.dialect_name == "postgresql":
+            order_by = order_by.collate("C")
+
+        result = await self.db.execute(
+            select(TechniqueCount.technique_id, in_base, in_compare)
+            .where(TechniqueCount.source.in_((base_source, compare_source)))
+            .group_by(TechniqueCount.technique_id)
+            .order_by(order_by)
+        )
+        return [(tech_id, bool(base), bool(compare)) for tech_id, base, compare in result.all()]
+
+    async def _fetch_grouped_by_source(self, query) -> dict[str, list[Row]]:
+        """Execute a list-view query and group the resulting rows by source."""
         result = await self.db.execute(query)
-        detections = result.scalars().all()
 
-        # Group by source
-        grouped: dict[str, list[Detection]] = {}
-        for detection in detections:
-            if detection.source not in grouped:
-                grouped[detection.source] = []
-            grouped[detection.source].append(detection)
+        grouped: dict[str, list[Row]] = {}
+        for row in result.all():
+            grouped.setdefault(row.source, []).append(row)
 
         return grouped
 
@@ -297,6 +593,31 @@ class SearchService:
 
         return [r for r in result.scalars().all() if r]
 
+    async def get_filter_options(self) -> dict[str, list[str]]:
+        """Get the distinct values of every filter dropdown in one query.
+
+        Returns:
+            Dict with "sources", "statuses", "severities" and "languages" lists
+        """
+        query = union_all(*(
+            select(literal(option).label("option"), column.label("value")).distinct()
+            for option, column in (
+                ("sources", Detection.source),
+                ("statuses", Detection.status),
+                ("severities", Detection.severity),
+                ("languages", Detection.language),
+            )
+        ))
+        result = await self.db.execute(query)
+
+        options: dict[str, list[str]] = {
+            "sources": [], "statuses": [], "severities": [], "languages": [],
+        }
+        for option, value in result.all():
+            if value:
+                options[option].append(value)
+        return options
+
     def _build_conditions(self, filters: SearchFilters) -> list:
         """Build SQLAlchemy filter conditions from search filters."""
         conditions = []
@@ -0,0 +1,17 @@
+"""HTTP caching helpers."""
+
+from fastapi import Request
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches an ETag.
+
+    Weak validators match their strong counterpart, as If-None-Match
+    uses weak comparison.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
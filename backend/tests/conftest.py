@@ -2,8 +2,11 @@
 
 import pytest
 import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from app.database import Base
+from app.database import Base, get_db, get_session_maker
+from app.main import app
+from app.models.detection import Detection
 
 
 @pytest_asyncio.fixture
@@ -27,6 +30,38 @@ async def db_session():
     await engine.dispose()
 
 
+@pytest_asyncio.fixture
+async def client(db_session):
+    """HTTP client for the app, wired to the in-memory test database.
+
+    Test modules seed their own data by overriding this fixture with one
+    that requests it.
+    """
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_maker] = lambda: async_sessionmaker(
+        db_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+def make_detection(source: str, file_name: str, **fields) -> Detection:
+    """Build a minimal detection row; keyword arguments set or override columns."""
+    return Detection(**{
+        "source": source,
+        "source_file": file_name,
+        "source_repo_url": "https://example.com/repo",
+        "title": f"{source} {file_name}",
+        "detection_logic": "",
+        "raw_content": "",
+        **fields,
+    })
+
+
 # Sample rule content for testing
 SAMPLE_SIGMA_RULE = """
 title: Suspicious PowerShell Command Line
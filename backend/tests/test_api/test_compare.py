@@ -0,0 +1,182 @@
+"""Tests for cross-vendor comparison endpoints."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models.detection import Detection
+from app.services.cache import invalidate_caches
+from app.services.mitre import mitre_service
+from app.services.search import SearchService
+from tests.conftest import make_detection
+
+
+@pytest.fixture
+def mitre_data(monkeypatch):
+    """Load a small, fixed set of MITRE tactics and techniques."""
+    async def ensure_loaded():
+        pass
+
+    monkeypatch.setattr(mitre_service, "ensure_loaded", ensure_loaded)
+    monkeypatch.setattr(mitre_service, "_tactics", {
+        "TA0002": {"id": "TA0002", "name": "Execution", "short_name": "execution"},
+        "TA0006": {"id": "TA0006", "name": "Credential Access", "short_name": "credential-access"},
+    })
+    monkeypatch.setattr(mitre_service, "_techniques", {
+        "T1059": {"id": "T1059", "name": "Command and Scripting Interpreter", "tactics": ["TA0002"], "is_subtechnique": False},
+        "T1059.001": {"id": "T1059.001", "name": "PowerShell", "tactics": ["TA0002"], "is_subtechnique": True},
+        "T1003": {"id": "T1003", "name": "OS Credential Dumping", "tactics": ["TA0006"], "is_subtechnique": False},
+    })
+    monkeypatch.setattr(mitre_service, "_techniques_by_tactic", {})
+    monkeypatch.setattr(mitre_service, "_parent_techniques_by_tactic", {})
+    mitre_service._index_techniques()
+
+
+@pytest_asyncio.fixture
+async def client(client, db_session):
+    """HTTP client wired to a test database with detections from three sources."""
+    db_session.add_all([
+        make_detection("sigma", "a.yml", mitre_techniques=["T1059", "T1059.001"]),
+        make_detection("sigma", "b.yml", mitre_techniques=["T1059.001"]),
+        make_detection("elastic", "c.toml", mitre_techniques=["T1003"]),
+        make_detection("elastic", "d.toml", mitre_techniques=[]),
+        make_detection("splunk", "e.yml", mitre_techniques=["T9999"]),
+    ])
+    await db_session.flush()
+    await SearchService(db_session).refresh_technique_counts()
+    await db_session.commit()
+    invalidate_caches()
+    return client
+
+
+async def test_coverage_matrix_counts(client, mitre_data):
+    """Test coverage counts are grouped per source and rolled up to parents."""
+    response = await client.get("/api/compare/coverage-matrix")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["sources"] == ["elastic", "sigma", "splunk"]
+    assert [t["id"] for t in data["tactics"][0]["techniques"]] == ["T1059", "T1059.001"]
+    techniques = {
+        t["id"]: t
+        for tactic in data["tactics"]
+        for t in tactic["techniques"]
+    }
+    assert techniques["T1059"]["coverage"] == {"elastic": 0, "sigma": 3, "splunk": 0}
+    assert techniques["T1059.001"]["coverage"]["sigma"] == 2
+    assert techniques["T1059"]["sources_with_coverage"] == 1
+    assert techniques["T1003"]["total_detections"] == 1
+    assert data["summary"]["unmapped_techniques"] == ["T9999"]
+    assert data["summary"]["source_coverage"]["sigma"]["covered_techniques"] == 2
+
+
+async def test_coverage_matrix_without_subtechniques(client, mitre_data):
+    """Test sub-techniques can be excluded from the matrix."""
+    response = await client.get(
+        "/api/compare/coverage-matrix",
+        params={"tactic": "TA0002", "include_subtechniques": "false"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["id"] for t in data["tactics"][0]["techniques"]] == ["T1059"]
+
+
+async def test_coverage_matrix_invalid_tactic(client, mitre_data):
+    """Test an unknown tactic is rejected."""
+    response = await client.get("/api/compare/coverage-matrix", params={"tactic": "ta9999"})
+    assert response.status_code == 400
+
+
+async def test_coverage_gap(client):
+    """Test techniques are split into gaps, overlaps, and unique sets."""
+    response = await client.get(
+        "/api/compare/coverage-gap",
+        params={"base_source": "sigma", "compare_source": "elastic"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["base_technique_count"] == 2
+    assert data["compare_technique_count"] == 1
+    assert data["overlap_count"] == 0
+    assert data["gaps"] == ["T1059", "T1059.001"]
+    assert data["unique_to_compare"] == ["T1003"]
+
+
+async def test_coverage_gap_same_source(client):
+    """Test comparing a source with itself is all overlap."""
+    response = await client.get(
+        "/api/compare/coverage-gap",
+        params={"base_source": "sigma", "compare_source": "sigma"},
+    )
+    data = response.json()
+    assert data["overlap_count"] == 2
+    assert data["gaps"] == []
+    assert data["unique_to_compare"] == []
+
+
+async def test_coverage_gap_invalid_source(client):
+    """Test unknown sources are rejected."""
+    response = await client.get(
+        "/api/compare/coverage-gap",
+        params={"base_source": "sigma", "compare_source": "nope"},
+    )
+    assert response.status_code == 400
+
+
+async def test_compare_by_technique(client):
+    """Test detections are grouped by source for a technique."""
+    response = await client.get("/api/compare", params={"technique": "T1059.001"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query_type"] == "technique"
+    assert data["total_by_source"] == {"sigma": 2}
+    assert {d["source_file"] for d in data["results"]["sigma"]} == {"a.yml", "b.yml"}
+
+
+async def test_compare_post_with_sources(client):
+    """Test the POST variant honours the source filter."""
+    response = await client.post(
+        "/api/compare",
+        json={"technique": "T1003", "sources": ["sigma"]},
+    )
+    assert response.status_code == 200
+    assert response.json()["total_by_source"] == {}
+
+
+async def test_compare_requires_query(client):
+    """Test a technique, keyword, or platform is required."""
+    response = await client.get("/api/compare")
+    assert response.status_code == 400
+
+
+async def test_side_by_side(client, db_session):
+    """Test side-by-side returns one value per detection for each field."""
+    result = await db_session.execute(
+        select(Detection.id).where(Detection.source == "sigma").order_by(Detection.source_file)
+    )
+    ids = list(result.scalars())
+
+    response = await client.post("/api/compare/side-by-side", json={"ids": ids})
+    assert response.status_code == 200
+    fields = response.json()["field_comparison"]
+    assert sorted(fields["mitre_techniques"]) == ["T1059, T1059.001", "T1059.001"]
+    assert fields["source"] == ["sigma", "sigma"]
+    assert fields["description"] == ["", ""]
+    assert len(fields) == 13
+
+
+async def test_refresh_technique_counts_for_source(client, db_session):
+    """Test refreshing one source leaves other sources' counts alone."""
+    db_session.add(make_detection("sigma", "c.yml", mitre_techniques=["T1003"]))
+    await db_session.flush()
+    service = SearchService(db_session)
+    await service.refresh_technique_counts("sigma")
+
+    counts = {(s, t): n for s, t, n in await service.count_techniques_by_source()}
+    assert counts == {
+        ("sigma", "T1059"): 1,
+        ("sigma", "T1059.001"): 2,
+        ("sigma", "T1003"): 1,
+        ("elastic", "T1003"): 1,
+        ("splunk", "T9999"): 1,
+    }
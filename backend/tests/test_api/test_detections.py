@@ -0,0 +1,52 @@
+"""Tests for detection endpoints."""
+
+import pytest_asyncio
+
+from app.services.cache import invalidate_caches
+from tests.conftest import make_detection
+
+
+@pytest_asyncio.fixture
+async def client(client, db_session):
+    """HTTP client wired to a test database with a few detections."""
+    db_session.add_all([
+        make_detection("sigma", "a.yml", status="stable", severity="high", language="sigma"),
+        make_detection("sigma", "b.yml", status="experimental", severity="high", language="sigma"),
+        make_detection("elastic", "c.toml", status="stable", severity="low", language="eql"),
+    ])
+    await db_session.commit()
+    invalidate_caches()
+    return client
+
+
+async def test_filter_options(client):
+    """Test each dropdown lists its distinct values."""
+    response = await client.get("/api/detections/filters")
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(data["sources"]) == ["elastic", "sigma"]
+    assert sorted(data["statuses"]) == ["experimental", "stable"]
+    assert sorted(data["severities"]) == ["high", "low"]
+    assert sorted(data["languages"]) == ["eql", "sigma"]
+
+
+async def test_list_detections_filtered(client):
+    """Test list filtering by comma-separated sources."""
+    response = await client.get("/api/detections", params={"sources": "elastic"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["source_file"] == "c.toml"
+
+
+async def test_search_detections(client):
+    """Test the POST search pages and sorts list items."""
+    response = await client.post(
+        "/api/detections/search",
+        json={"sources": ["sigma"], "sort_by": "title", "sort_order": "desc", "limit": 1},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert len(data["items"]) == 1
+    assert "raw_content" not in data["items"][0]
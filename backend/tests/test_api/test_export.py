@@ -0,0 +1,102 @@
+"""Tests for export endpoints."""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest_asyncio
+
+from tests.conftest import make_detection
+
+
+@pytest_asyncio.fixture
+async def client(client, db_session):
+    """HTTP client wired to a test database with two detections."""
+    db_session.add_all([
+        make_detection(
+            "sigma",
+            "a.yml",
+            id="id-1",
+            title="First, with comma",
+            detection_logic="logic 1",
+            raw_content="raw 1",
+            mitre_techniques=["T1059", "T1059.001"],
+        ),
+        make_detection(
+            "elastic",
+            "b.toml",
+            id="id-2",
+            title="Second",
+            detection_logic="logic 2",
+            raw_content="raw 2",
+        ),
+    ])
+    await db_session.commit()
+    return client
+
+
+async def test_export_csv(client):
+    """Test CSV export writes a header and one row per detection."""
+    response = await client.post("/api/export", json={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0][:5] == ["id", "source", "source_file", "source_repo_url", "title"]
+    assert len(rows) == 3
+    by_id = {row[0]: row for row in rows[1:]}
+    assert by_id["id-1"][4] == "First, with comma"
+    assert by_id["id-1"][12] == "T1059,T1059.001"
+
+
+async def test_export_json_by_ids(client):
+    """Test JSON export of specific IDs, including raw content."""
+    response = await client.post(
+        "/api/export",
+        json={"format": "json", "ids": ["id-2", "missing"], "include_raw": True},
+    )
+    assert response.status_code == 200
+    data = json.loads(response.content)
+    assert [d["id"] for d in data] == ["id-2"]
+    assert data[0]["raw_content"] == "raw 2"
+    assert datetime.fromisoformat(data[0]["created_at"])
+
+
+async def test_export_nothing_found(client):
+    """Test exporting unknown IDs returns 404."""
+    response = await client.post("/api/export", json={"ids": ["missing"]})
+    assert response.status_code == 404
+
+
+async def test_export_gzip(client):
+    """Test exports are gzip-compressed when the client accepts it."""
+    response = await client.post(
+        "/api/export",
+        json={"format": "json"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert {d["id"] for d in response.json()} == {"id-1", "id-2"}
+
+
+async def test_export_identity(client):
+    """Test exports are sent uncompressed when gzip isn't accepted."""
+    response = await client.post(
+        "/api/export",
+        json={"format": "csv"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.text.startswith("id,source")
+
+
+async def test_export_filtered_raw_content(client):
+    """Test raw content is only loaded for filtered exports that ask for it."""
+    response = await client.post("/api/export", json={"format": "json"})
+    assert all("raw_content" not in d for d in response.json())
+
+    response = await client.post("/api/export", json={"format": "json", "include_raw": True})
+    assert {d["raw_content"] for d in response.json()} == {"raw 1", "raw 2"}
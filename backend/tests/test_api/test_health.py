@@ -15,3 +15,22 @@ def test_health_check():
     data = response.json()
     assert data["status"] == "healthy"
     assert "app" in data
+
+
+def test_cors_preflight_allowed_origin():
+    """Test a configured origin passes the CORS preflight."""
+    response = client.options(
+        "/api/health",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+
+def test_cors_rejects_unknown_origin():
+    """Test an unconfigured origin gets no CORS allow header."""
+    response = client.get("/api/health", headers={"Origin": "https://evil.example"})
+    assert "access-control-allow-origin" not in response.headers
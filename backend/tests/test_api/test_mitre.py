@@ -0,0 +1,55 @@
+"""Tests for MITRE ATT&CK endpoints."""
+
+import pytest
+import pytest_asyncio
+
+from app.services.mitre import mitre_service
+
+
+@pytest.fixture
+def mitre_data(monkeypatch):
+    """Load a small, fixed set of MITRE tactics and techniques."""
+    async def ensure_loaded():
+        pass
+
+    monkeypatch.setattr(mitre_service, "ensure_loaded", ensure_loaded)
+    monkeypatch.setattr(mitre_service, "_tactics", {
+        "TA0002": {"id": "TA0002", "name": "Execution", "short_name": "execution"},
+    })
+    monkeypatch.setattr(mitre_service, "_techniques", {
+        "T1059": {"id": "T1059", "name": "Command and Scripting Interpreter", "tactics": ["TA0002"]},
+    })
+    mitre_service._index_techniques()
+
+
+@pytest_asyncio.fixture
+async def client(client, mitre_data):
+    """HTTP client for the API app, serving the fixed MITRE data."""
+    return client
+
+
+async def test_tactics_etag_revalidation(client):
+    """Test a matching If-None-Match gets a 304 with no body."""
+    response = await client.get("/api/mitre/tactics")
+    assert response.status_code == 200
+    assert response.json() == mitre_service.get_all_tactics()
+    etag = response.headers["etag"]
+
+    response = await client.get("/api/mitre/tactics", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+async def test_etag_changes_on_reload(client):
+    """Test reloading different data changes the ETag and the payload."""
+    response = await client.get("/api/mitre/techniques")
+    etag = response.headers["etag"]
+
+    mitre_service._techniques["T1003"] = {"id": "T1003", "name": "OS Credential Dumping", "tactics": []}
+    mitre_service._index_techniques()
+
+    response = await client.get("/api/mitre/techniques", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert set(response.json()) == {"T1059", "T1003"}
@@ -0,0 +1,71 @@
+"""Tests for GitHub release endpoints."""
+
+import httpx
+import pytest_asyncio
+
+from app.api.routes import releases
+from app.services.cache import invalidate_caches
+
+RELEASE = {
+    "id": 1,
+    "tag_name": "r2024-01-01",
+    "name": None,
+    "published_at": "2024-01-01T00:00:00Z",
+    "html_url": "https://github.com/SigmaHQ/sigma/releases/tag/r2024-01-01",
+    "body": None,
+    "author": {"login": "someone"},
+}
+
+
+@pytest_asyncio.fixture
+async def github(monkeypatch):
+    """Route the shared GitHub client to a fake API that records requests."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[RELEASE], headers={"ETag": '"v1"'})
+
+    invalidate_caches()
+    monkeypatch.setattr(releases, "_release_etags", {})
+    monkeypatch.setattr(releases, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    yield calls
+    await releases.close_http_client()
+
+
+async def test_get_releases_cached(client, github):
+    """Test releases are simplified and served from cache on repeat."""
+    first = await client.get("/api/releases/sigma")
+    second = await client.get("/api/releases/sigma")
+
+    assert first.status_code == 200
+    assert first.json() == second.json() == [{
+        "id": 1,
+        "tag_name": "r2024-01-01",
+        "name": "r2024-01-01",
+        "published_at": "2024-01-01T00:00:00Z",
+        "html_url": RELEASE["html_url"],
+        "body": "",
+        "author": "someone",
+    }]
+    assert len(github) == 1
+
+
+async def test_get_releases_revalidates_with_etag(client, github):
+    """Test an expired entry is revalidated and a 304 reuses the payload."""
+    first = await client.get("/api/releases/sigma")
+    invalidate_caches()
+    second = await client.get("/api/releases/sigma")
+
+    assert second.json() == first.json()
+    assert len(github) == 2
+    assert github[1].headers["If-None-Match"] == '"v1"'
+
+
+async def test_get_releases_unknown_source(client, github):
+    """Test sources without releases are rejected during validation."""
+    response = await client.get("/api/releases/lolrmm")
+    assert response.status_code == 422
+    assert github == []
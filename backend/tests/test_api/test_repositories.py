@@ -0,0 +1,54 @@
+"""Tests for repository management endpoints."""
+
+import asyncio
+
+from app.api.routes.repositories import ALL_REPOSITORIES
+from app.services.repository_sync import RepositorySyncService
+
+
+async def test_ingest_all_unsynced(client):
+    """Test ingest-all reports every unsynced repository, in order."""
+    response = await client.post("/api/repositories/ingest-all")
+    assert response.status_code == 200
+    results = response.json()
+    assert len(results) == len(ALL_REPOSITORIES)
+    assert all(not r["success"] for r in results)
+    assert [r["message"] for r in results] == [
+        f"Repository {name} has not been synced yet" for name in ALL_REPOSITORIES
+    ]
+
+
+async def test_sync_all_one_writer_on_sqlite(client, monkeypatch):
+    """Test sync-all syncs one repository at a time on SQLite, reporting all in order."""
+    running = 0
+    peak = 0
+
+    async def fake_sync_repository(self, name):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return True, f"Synced {name}"
+
+    monkeypatch.setattr(RepositorySyncService, "sync_repository", fake_sync_repository)
+
+    response = await client.post("/api/repositories/sync-all")
+    assert response.status_code == 200
+    assert [r["repository"] for r in response.json()] == list(ALL_REPOSITORIES)
+    assert peak == 1
+
+
+async def test_list_repositories(client, db_session):
+    """Test listing returns the rows created at startup."""
+    await RepositorySyncService(db_session).ensure_all_repositories()
+
+    response = await client.get("/api/repositories")
+    assert response.status_code == 200
+    assert sorted(r["name"] for r in response.json()) == sorted(ALL_REPOSITORIES)
+
+
+async def test_sync_unknown_repository(client):
+    """Test unknown repository names are rejected during validation."""
+    response = await client.post("/api/repositories/nope/sync")
+    assert response.status_code == 422
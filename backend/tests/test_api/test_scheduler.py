@@ -0,0 +1,92 @@
+"""Tests for scheduler and sync job endpoints."""
+
+import uuid
+from datetime import datetime
+
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.sync_job import SyncJob
+from app.services import scheduler as scheduler_service
+from app.services.repository_sync import RepositorySyncService
+from app.services.scheduler import scheduler
+
+
+@pytest_asyncio.fixture
+async def client(client, db_session):
+    """HTTP client wired to a test database with one sync job."""
+    db_session.add(SyncJob(
+        id="job-1",
+        job_type="sync",
+        repository="sigma",
+        status="completed",
+        started_at=datetime(2024, 1, 1, 2, 0),
+        completed_at=datetime(2024, 1, 1, 2, 5),
+        duration_seconds=300.0,
+        rules_stored=10,
+        repository_results={"sigma": {"stored": 10}},
+    ))
+    await db_session.commit()
+    return client
+
+
+async def test_get_sync_jobs(client):
+    """Test job history is serialized from the stored rows."""
+    response = await client.get("/api/scheduler/jobs")
+    assert response.status_code == 200
+    jobs = response.json()
+    assert len(jobs) == 1
+    assert jobs[0]["id"] == "job-1"
+    assert jobs[0]["rules_stored"] == 10
+    assert jobs[0]["repository_results"] == {"sigma": {"stored": 10}}
+    assert jobs[0]["started_at"] == "2024-01-01T02:00:00"
+
+
+async def test_get_sync_job_not_found(client):
+    """Test an unknown job ID returns 404."""
+    response = await client.get("/api/scheduler/jobs/missing")
+    assert response.status_code == 404
+
+
+async def test_trigger_sync_creates_pending_job(client, monkeypatch):
+    """Test the returned job ID can be polled at once and is the one the background job runs."""
+    calls = []
+
+    async def fake_run_full_sync_job(**kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr(scheduler, "run_full_sync_job", fake_run_full_sync_job)
+
+    response = await client.post("/api/scheduler/trigger", json={"repository": "sigma"})
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    assert calls == [{"triggered_by": "manual", "repository": "sigma", "job_id": job_id}]
+
+    response = await client.get(f"/api/scheduler/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "pending"
+
+
+async def test_run_full_sync_job_updates_pending_job(db_session, monkeypatch):
+    """Test the background job fills in the pending record instead of adding its own."""
+    async def fake_sync_repository(self, repo_name):
+        return False, "Repository sigma has not been synced yet"
+
+    monkeypatch.setattr(
+        scheduler_service,
+        "async_session_maker",
+        async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(RepositorySyncService, "sync_repository", fake_sync_repository)
+    job = SyncJob(id=str(uuid.uuid4()), job_type="full", repository="sigma", status="pending")
+    db_session.add(job)
+    await db_session.commit()
+
+    await scheduler.run_full_sync_job(triggered_by="manual", repository="sigma", job_id=job.id)
+
+    jobs = (await db_session.execute(
+        select(SyncJob).where(SyncJob.job_type == "full").execution_options(populate_existing=True)
+    )).scalars().all()
+    assert [(j.id, j.status, j.error_count) for j in jobs] == [(job.id, "completed", 1)]
+    assert jobs[0].started_at is not None
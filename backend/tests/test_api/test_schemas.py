@@ -0,0 +1,60 @@
+"""Tests for API schema helpers."""
+
+from datetime import datetime
+
+from app.api.schemas import DetectionListItem, sanitize_string
+from app.models.detection import Detection
+
+
+def test_from_detection_matches_validated_model():
+    """Test the unvalidated constructor produces the same payload as validation."""
+    detection = Detection(
+        id="abc",
+        source="sigma",
+        source_file="rules/a\x00.yml",
+        source_repo_url="https://example.com/repo",
+        title="Title",
+        status="stable",
+        severity="high",
+        log_sources=["windows", {"name": "sysmon"}],
+        data_sources=[],
+        platform="windows",
+        event_category="process",
+        data_source_normalized="sysmon",
+        mitre_tactics=["TA0002"],
+        mitre_techniques=["T1059"],
+        detection_logic="logic",
+        language="sigma",
+        tags=[],
+        references=[],
+        false_positives=[],
+        raw_content="",
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 2),
+    )
+
+    fast = DetectionListItem.from_detection(detection)
+    validated = DetectionListItem(**DetectionListItem._fields_from_detection(detection))
+    assert fast.model_dump() == validated.model_dump()
+    assert fast.source_file == "rules/a.yml"
+    assert fast.log_sources == ["windows", "sysmon"]
+
+
+def test_sanitize_string():
+    """Test control characters are stripped and common whitespace kept."""
+    assert sanitize_string(None) == ""
+    assert sanitize_string(b"bytes\x00") == "bytes"
+    assert sanitize_string("a\x00b\x07c\x1fd\x7fe") == "abcde"
+    assert sanitize_string("tab\tnew\nline\r") == "tab\tnew\nline\r"
+    assert sanitize_string("café ✓") == "café ✓"
+
+
+def test_sanitize_string_non_ascii_with_control_chars():
+    """Test control characters are stripped from non-ASCII text too."""
+    assert sanitize_string("règle\x00\nété\x1b") == "règle\nété"
+
+
+def test_sanitize_string_surrogates():
+    """Test escaped surrogates are replaced and other lone surrogates dropped."""
+    assert sanitize_string("bad \udcff byte") == "bad � byte"
+    assert sanitize_string("lone \ud800") == ""
@@ -0,0 +1,153 @@
+"""Tests for trending endpoints."""
+
+from datetime import datetime, timedelta
+
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models.detection_technique import DetectionTechnique
+from app.services.cache import invalidate_caches
+from app.services.search import SearchService
+from tests.conftest import make_detection
+
+NOW = datetime.utcnow()
+
+
+def days_ago(days: int) -> datetime:
+    """A rule_modified_date the given number of days in the past."""
+    return NOW - timedelta(days=days)
+
+
+@pytest_asyncio.fixture
+async def client(client, db_session):
+    """HTTP client wired to a test database with recent and old detections."""
+    db_session.add_all([
+        make_detection("sigma", "a.yml", mitre_techniques=["T1059", "T1003"], platform="windows",
+                       rule_modified_date=days_ago(1)),
+        make_detection("elastic", "b.toml", mitre_techniques=["T1059"], platform="windows",
+                       rule_modified_date=days_ago(2)),
+        make_detection("elastic", "c.toml", mitre_techniques=["T1059"], platform="linux",
+                       rule_modified_date=days_ago(3)),
+        make_detection("sigma", "old.yml", mitre_techniques=["T1003", "T1105"], platform="linux",
+                       rule_modified_date=days_ago(200)),
+    ])
+    await db_session.flush()
+    search_service = SearchService(db_session)
+    await search_service.refresh_detection_techniques()
+    await search_service.refresh_daily_counts()
+    await db_session.commit()
+    invalidate_caches()
+    return client
+
+
+async def test_trending_techniques(client):
+    """Test techniques are counted across sources within the window."""
+    response = await client.get("/api/trending/techniques", params={"days": 30})
+    assert response.status_code == 200
+    techniques = response.json()["techniques"]
+
+    assert [t["technique_id"] for t in techniques] == ["T1059", "T1003"]
+    assert techniques[0]["count"] == 3
+    assert techniques[0]["sources"] == ["elastic", "sigma"]
+    assert techniques[0]["latest_date"] == (NOW - timedelta(days=1)).isoformat()
+    assert techniques[1]["count"] == 1
+
+
+async def test_trending_platforms(client):
+    """Test platforms are counted across sources within the window."""
+    response = await client.get("/api/trending/platforms", params={"days": 30})
+    assert response.status_code == 200
+    platforms = response.json()["platforms"]
+
+    assert [p["platform"] for p in platforms] == ["windows", "linux"]
+    assert platforms[0]["count"] == 2
+    assert platforms[0]["sources"] == ["elastic", "sigma"]
+    assert platforms[1]["sources"] == ["elastic"]
+
+
+async def test_trending_summary(client):
+    """Test the summary counts rules per source within the window."""
+    response = await client.get("/api/trending/summary", params={"days": 30})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_modified"] == 3
+    assert data["by_source"] == {"elastic": 2, "sigma": 1}
+
+
+async def test_trending_cached_until_invalidated(client, db_session):
+    """Test repeated requests are served from cache until ingestion invalidates it."""
+    first = (await client.get("/api/trending/platforms", params={"days": 30})).json()
+
+    db_session.add(make_detection("splunk", "d.yml", platform="macos", rule_modified_date=days_ago(1)))
+    await db_session.commit()
+    assert (await client.get("/api/trending/platforms", params={"days": 30})).json() == first
+
+    invalidate_caches()
+    platforms = (await client.get("/api/trending/platforms", params={"days": 30})).json()["platforms"]
+    assert "macos" in [p["platform"] for p in platforms]
+
+
+async def test_refresh_detection_techniques_for_source(client, db_session):
+    """Test refreshing one source expands only its dated detections."""
+    db_session.add_all([
+        make_detection("sigma", "new.yml", mitre_techniques=["T1105"], rule_modified_date=days_ago(1)),
+        make_detection("sigma", "undated.yml", mitre_techniques=["T1490"]),
+    ])
+    await db_session.flush()
+    await SearchService(db_session).refresh_detection_techniques("sigma")
+
+    result = await db_session.execute(
+        select(DetectionTechnique.source, DetectionTechnique.technique_id)
+    )
+    assert sorted(result.all()) == [
+        ("elastic", "T1059"),
+        ("elastic", "T1059"),
+        ("sigma", "T1003"),
+        ("sigma", "T1003"),
+        ("sigma", "T1059"),
+        ("sigma", "T1105"),
+        ("sigma", "T1105"),
+    ]
+
+
+async def test_trending_etag_revalidation(client):
+    """Test a matching If-None-Match gets a 304 without a body."""
+    response = await client.get("/api/trending/summary", params={"days": 30})
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        "/api/trending/summary", params={"days": 30}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = await client.get(
+        "/api/trending/summary", params={"days": 60}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+
+async def test_precomputed_counts_stale(db_session):
+    """Test staleness is detected until the precomputed tables are rebuilt."""
+    search_service = SearchService(db_session)
+    assert not await search_service.precomputed_counts_stale()
+
+    db_session.add(make_detection("sigma", "a.yml", mitre_techniques=["T1059"], rule_modified_date=days_ago(1)))
+    await db_session.flush()
+    assert await search_service.precomputed_counts_stale()
+
+    await search_service.refresh_technique_counts()
+    await search_service.refresh_detection_techniques()
+    await search_service.refresh_daily_counts()
+    assert not await search_service.precomputed_counts_stale()
+
+
+async def test_trending_endpoints_share_day_cutoff(client):
+    """Test every endpoint reports the same midnight cutoff."""
+    cutoffs = set()
+    for endpoint in ("techniques", "platforms", "summary"):
+        response = await client.get(f"/api/trending/{endpoint}", params={"days": 30})
+        cutoffs.add(response.json()["cutoff_date"])
+
+    assert len(cutoffs) == 1
+    assert datetime.fromisoformat(cutoffs.pop()).time() == datetime.min.time()
@@ -0,0 +1,109 @@
+"""Tests for database setup."""
+
+from sqlalchemy import CheckConstraint, MetaData, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import Base, _column_type_upgrades, _constraint_violations, _upgrade_schema
+from app.models.detection import Detection
+from app.models.detection_technique import DetectionTechnique
+from app.models.repository import Repository
+from app.models.sync_job import SyncJob
+
+
+async def test_upgrade_schema_adds_missing_indexes():
+    """Test indexes missing from an existing detections table are created, idempotently."""
+    # The current schema, but with detections as it was before its indexes
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    metadata.tables[Detection.__tablename__].indexes.clear()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+        await conn.run_sync(_upgrade_schema)
+        indexes = await conn.run_sync(
+            lambda sync_conn: {index["name"] for index in inspect(sync_conn).get_indexes("detections")}
+        )
+    await engine.dispose()
+
+    assert {"ix_detections_source_title", "ix_detections_rule_modified_date"} <= indexes
+    # PostgreSQL-only indexes are skipped elsewhere
+    assert "ix_detections_title_trgm" not in indexes
+
+
+async def reflect_columns(table_name: str) -> list[dict]:
+    """Create the schema on SQLite and reflect one table's columns.
+
+    SQLite gets the types existing PostgreSQL databases were created with
+    (json lists, varchar(36) ids), so this stands in for an old table.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns(table_name))
+    await engine.dispose()
+    return columns
+
+
+async def test_column_type_upgrades_json_to_jsonb():
+    """Test json list columns on an existing table are converted to jsonb."""
+    columns = await reflect_columns("detections")
+    table = Detection.__table__
+
+    statements = [statement for _, statement in _column_type_upgrades(table, columns, postgresql.dialect())]
+    assert len(statements) == 8
+    assert (
+        "ALTER TABLE detections ALTER COLUMN mitre_techniques TYPE JSONB USING mitre_techniques::JSONB"
+        in statements
+    )
+    # Reserved words are quoted
+    assert 'ALTER TABLE detections ALTER COLUMN "references" TYPE JSONB USING "references"::JSONB' in statements
+
+    # Nothing left to do once the columns have the model's types
+    current = [{"name": column.name, "type": column.type} for column in table.columns]
+    assert _column_type_upgrades(table, current, postgresql.dialect()) == []
+
+
+async def test_column_type_upgrades_varchar_to_uuid():
+    """Test varchar(36) id columns on existing tables are converted to uuid."""
+    for table in (Detection.__table__, DetectionTechnique.__table__, Repository.__table__, SyncJob.__table__):
+        columns = await reflect_columns(table.name)
+        upgrades = _column_type_upgrades(table, columns, postgresql.dialect())
+        converted = {column.name: statement for column, statement in upgrades if "UUID" in statement}
+        key = "detection_id" if table is DetectionTechnique.__table__ else "id"
+        assert converted == {
+            key: f"ALTER TABLE {table.name} ALTER COLUMN {key} TYPE UUID USING {key}::UUID"
+        }
+
+
+async def test_constraint_violations_lists_legacy_values():
+    """Test existing values outside a CHECK constraint are found for logging."""
+    # detections as it was before the constraints, holding legacy values
+    metadata = MetaData()
+    table = Detection.__table__.to_metadata(metadata)
+    for constraint in [c for c in table.constraints if isinstance(c, CheckConstraint)]:
+        table.constraints.remove(constraint)
+    rows = [
+        {"source": "sigma", "source_file": f"{status}.yml", "source_repo_url": "https://example.com/repo",
+         "title": status, "detection_logic": "", "raw_content": "", "status": status}
+        for status in ("stable", "production", "test", "production")
+    ]
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(table.insert(), rows)
+        constraints = {constraint.name: constraint for constraint in Detection.__table__.constraints}
+        status_violations = await conn.run_sync(
+            _constraint_violations, table, constraints["ck_detections_status"]
+        )
+        severity_violations = await conn.run_sync(
+            _constraint_violations, table, constraints["ck_detections_severity"]
+        )
+    await engine.dispose()
+
+    assert status_violations == ["production", "test"]
+    assert severity_violations == []
@@ -1,5 +1,7 @@
 """Tests for base normalizer."""
 
+from datetime import datetime
+
 import pytest
 from app.normalizers.base import BaseNormalizer, NormalizedDetection
 from app.parsers.base import ParsedRule
@@ -61,6 +63,11 @@ class TestBaseNormalizer:
         assert len(parts[3]) == 4
         assert len(parts[4]) == 12
 
+    def test_generate_id_stable(self):
+        """Test IDs don't change between releases (they appear in detection URLs)."""
+        id = self.normalizer.generate_id("sigma", "rules/test.yml")
+        assert id == "95d591c4-7435-27b9-b1a0-fe8585bebc6c"
+
     def test_normalize_status(self):
         """Test status normalization."""
         assert self.normalizer.normalize_status("stable") == "stable"
@@ -105,7 +112,55 @@ class TestBaseNormalizer:
         result = self.normalizer.normalize_log_sources(log_source)
         assert result.count("windows") == 1
 
+    def test_normalize_log_sources_order(self):
+        """Test that log sources keep product, category, service order."""
+        log_source = {"service": "sysmon", "category": "Sysmon", "product": "windows"}
+        assert self.normalizer.normalize_log_sources(log_source) == ["windows", "sysmon"]
+
     def test_normalize_log_sources_empty(self):
         """Test normalization of empty log source."""
         result = self.normalizer.normalize_log_sources({})
         assert result == []
+
+    def test_parse_date_formats(self):
+        """Test dates in the ISO and slash formats used by rule sources."""
+        parse = self.normalizer.parse_date
+        assert parse("2023-01-15") == datetime(2023, 1, 15)
+        assert parse("2023/01/15") == datetime(2023, 1, 15)
+        assert parse("15/01/2023") == datetime(2023, 1, 15)
+        assert parse("01/15/2023") == datetime(2023, 1, 15)
+        assert parse("2023-01-15T10:30:00") == datetime(2023, 1, 15, 10, 30)
+        assert parse("2023-01-15T10:30:00.250Z") == datetime(2023, 1, 15, 10, 30, 0, 250000)
+        assert parse("2023-01-15 10:30:00") == datetime(2023, 1, 15, 10, 30)
+        assert parse("2023-1-5") == datetime(2023, 1, 5)
+        assert parse("2023/1/5") == datetime(2023, 1, 5)
+        assert parse("01/5/2023") == datetime(2023, 5, 1)
+
+    def test_parse_date_offset_converted_to_naive_utc(self):
+        """Test a UTC offset is applied and dropped."""
+        assert self.normalizer.parse_date("2023-01-15T12:00:00+02:00") == datetime(2023, 1, 15, 10, 0)
+
+    def test_parse_date_invalid(self):
+        """Test unparseable values return None."""
+        assert self.normalizer.parse_date("not a date") is None
+        assert self.normalizer.parse_date("") is None
+        assert self.normalizer.parse_date(None) is None
+
+    def test_normalize_data_sources(self):
+        """Test exact, partial and unmapped data sources."""
+        result = self.normalizer.normalize_data_sources(
+            ["sysmon", "Security", "windows_security_event", "custom_feed", "", "SYSMON"]
+        )
+        assert result == ["Sysmon", "Windows Security", "Custom Feed"]
+
+    def test_build_source_rule_url(self):
+        """Test rule URLs drop the .git suffix and normalize the path."""
+        normalizer = ConcreteNormalizer("https://github.com/SigmaHQ/sigma.git")
+        assert (
+            normalizer.build_source_rule_url("\\rules\\windows\\test.yml", branch="master")
+            == "https://github.com/SigmaHQ/sigma/blob/master/rules/windows/test.yml"
+        )
+        assert (
+            self.normalizer.build_source_rule_url("rules/test.yml")
+            == "https://example.com/repo/blob/main/rules/test.yml"
+        )
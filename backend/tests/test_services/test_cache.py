@@ -0,0 +1,172 @@
+"""Tests for the in-process cache helpers."""
+
+import asyncio
+
+import pytest
+
+from app.services.cache import SharedStream, TTLCache, invalidate_caches
+
+
+class Counter:
+    """Async value factory that counts its invocations."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.calls
+
+
+async def test_cache_hit():
+    """Test repeated lookups reuse the cached value."""
+    cache = TTLCache(ttl=60)
+    factory = Counter()
+    assert await cache.get_or_set("key", factory) == 1
+    assert await cache.get_or_set("key", factory) == 1
+    assert factory.calls == 1
+
+
+async def test_cache_expiry():
+    """Test entries are recomputed once the TTL has passed."""
+    cache = TTLCache(ttl=0)
+    factory = Counter()
+    await cache.get_or_set("key", factory)
+    await cache.get_or_set("key", factory)
+    assert factory.calls == 2
+
+
+async def test_cache_prunes_stale_keys():
+    """Test stale entries for other keys are dropped when a new value is stored."""
+    cache = TTLCache(ttl=0)
+    await cache.get_or_set("old", Counter())
+    await cache.get_or_set("new", Counter())
+    assert list(cache._entries) == ["new"]
+
+
+async def test_cache_clear():
+    """Test clearing leaves the cache empty, locks included."""
+    cache = TTLCache(ttl=60)
+    await cache.get_or_set("key", Counter())
+    cache.clear()
+    assert cache._entries == {}
+    assert cache._locks == {}
+
+
+async def test_invalidate_caches():
+    """Test invalidation forces recomputation."""
+    cache = TTLCache(ttl=60)
+    factory = Counter()
+    await cache.get_or_set("key", factory)
+    invalidate_caches()
+    assert await cache.get_or_set("key", factory) == 2
+
+
+async def test_concurrent_misses_coalesced():
+    """Test concurrent misses for one key compute the value once."""
+    cache = TTLCache(ttl=60)
+    factory = Counter()
+    results = await asyncio.gather(*(cache.get_or_set("key", factory) for _ in range(5)))
+    assert results == [1] * 5
+    assert factory.calls == 1
+
+
+async def chunks(count: int, produced: list | None = None):
+    """Source yielding count single-digit chunks, recording each it yields."""
+    for i in range(count):
+        await asyncio.sleep(0)
+        if produced is not None:
+            produced.append(i)
+        yield str(i).encode()
+
+
+async def test_shared_stream_fans_out_to_subscribers():
+    """Test one producer run serves every subscriber the full stream."""
+    runs = 0
+
+    async def source():
+        nonlocal runs
+        runs += 1
+        async for chunk in chunks(3):
+            yield chunk
+
+    done = []
+    shared = SharedStream(source(), on_done=lambda: done.append(True))
+    subscriptions = [shared.subscribe(), shared.subscribe()]
+    assert await shared.has_data()
+
+    async def collect(subscription):
+        return b"".join([chunk async for chunk in subscription])
+
+    assert await asyncio.gather(*map(collect, subscriptions)) == [b"012", b"012"]
+    assert runs == 1
+    assert done == [True]
+    assert shared._chunks == []
+
+
+async def test_shared_stream_follower_outlives_leader():
+    """Test a subscriber keeps the producer alive after another disconnects."""
+    shared = SharedStream(chunks(5))
+    leader, follower = shared.subscribe(), shared.subscribe()
+    assert await shared.has_data()
+
+    assert await anext(leader) == b"0"
+    await leader.aclose()
+
+    assert b"".join([chunk async for chunk in follower]) == b"01234"
+
+
+async def test_shared_stream_cancelled_producer_fails_subscribers():
+    """Test a producer cut off mid-stream is reported, not ended cleanly."""
+    shared = SharedStream(chunks(5))
+    subscription = shared.subscribe()
+    assert await anext(subscription) == b"0"
+
+    shared._task.cancel()
+    with pytest.raises(RuntimeError):
+        async for _ in subscription:
+            pass
+
+
+async def test_shared_stream_backpressure():
+    """Test the producer stops once max_buffered chunks are unread."""
+    produced = []
+    shared = SharedStream(chunks(100, produced), max_buffered=4)
+    subscription = shared.subscribe()
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+    assert len(produced) == 4
+    assert await anext(subscription) == b"0"
+    assert len(shared._chunks) == 3
+    subscription.close()
+
+
+async def test_shared_stream_closed_to_late_subscribers():
+    """Test no one can join once chunks have been dropped."""
+    shared = SharedStream(chunks(5))
+    subscription = shared.subscribe()
+    assert await anext(subscription) == b"0"
+    assert shared.subscribe() is None
+    subscription.close()
+
+
+async def test_shared_stream_dropped_subscription_cancels_producer():
+    """Test a subscription that is never read still releases the producer."""
+    shared = SharedStream(chunks(100), max_buffered=2)
+    subscription = shared.subscribe()
+    await asyncio.sleep(0)
+
+    del subscription
+    await asyncio.sleep(0)
+    assert shared._task.cancelled()
+
+
+async def test_shared_stream_empty_source():
+    """Test an empty source reports no data."""
+    async def source():
+        return
+        yield
+
+    assert not await SharedStream(source()).has_data()
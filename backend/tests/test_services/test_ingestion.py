@@ -0,0 +1,81 @@
+"""Tests for the ingestion service."""
+
+from sqlalchemy import MetaData, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.detection import Detection
+from app.services.ingestion import IngestionService
+from app.services.ingestion_errors import IngestionStats
+
+
+def make_row(detection_id: str, file_name: str) -> dict:
+    """Build a minimal detections row."""
+    return {
+        "id": detection_id,
+        "source": "sigma",
+        "source_file": file_name,
+        "source_repo_url": "https://example.com/repo",
+        "title": file_name,
+        "detection_logic": "",
+        "raw_content": "",
+    }
+
+
+async def test_store_rules_bulk_insert(db_session):
+    """Test a batch of rows is stored in one go with database timestamps."""
+    stats = IngestionStats()
+    stored = await IngestionService(db_session)._store_rules_safe(
+        [make_row("id-1", "a.yml"), make_row("id-2", "b.yml")], stats
+    )
+
+    assert stored == 2
+    result = await db_session.execute(select(Detection.source_file, Detection.created_at))
+    rows = sorted(result.all())
+    assert [file_name for file_name, _ in rows] == ["a.yml", "b.yml"]
+    assert all(created_at is not None for _, created_at in rows)
+
+
+async def test_store_rules_falls_back_per_row(db_session):
+    """Test a failing batch is retried row by row, recording the bad row."""
+    stats = IngestionStats()
+    stored = await IngestionService(db_session)._store_rules_safe(
+        [make_row("id-1", "a.yml"), make_row("id-1", "dup.yml"), make_row("id-2", "b.yml")],
+        stats,
+    )
+
+    assert stored == 2
+    assert [error.file_path for error in stats.errors] == ["dup.yml"]
+
+
+async def test_store_rules_rejects_unknown_severity(db_session):
+    """Test a severity outside the normalized vocabulary is refused by the database."""
+    stats = IngestionStats()
+    bad = make_row("id-2", "bad.yml") | {"severity": "urgent"}
+    stored = await IngestionService(db_session)._store_rules_safe(
+        [make_row("id-1", "a.yml"), bad], stats
+    )
+
+    assert stored == 1
+    assert [error.file_path for error in stats.errors] == ["bad.yml"]
+
+
+async def test_store_rules_without_server_defaults():
+    """Test rows store on a detections table created before the timestamp server defaults."""
+    metadata = MetaData()
+    table = Detection.__table__.to_metadata(metadata)
+    table.c.created_at.server_default = None
+    table.c.updated_at.server_default = None
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        stored = await IngestionService(session)._store_rules_safe(
+            [make_row("id-1", "a.yml")], IngestionStats()
+        )
+        created_at = await session.scalar(select(Detection.created_at))
+
+    await engine.dispose()
+    assert stored == 1
+    assert created_at is not None
@@ -0,0 +1,36 @@
+"""Tests for the MITRE ATT&CK service."""
+
+from app.services.mitre import MitreAttackService
+
+
+def make_service(techniques: dict) -> MitreAttackService:
+    """Build a service with a fixed technique set."""
+    service = MitreAttackService()
+    service._techniques = techniques
+    service._index_techniques()
+    return service
+
+
+def test_map_technique_memoized_until_reload():
+    """Test mappings are memoized and reset when techniques are reindexed."""
+    service = make_service({"T1059": {"id": "T1059", "tactics": ["TA0002"]}})
+
+    assert service.map_technique("T1059") == "T1059"
+    assert service.map_technique("T9999") is None
+    assert service._mapped_techniques == {"T1059": "T1059", "T9999": None}
+
+    service._techniques["T9999"] = {"id": "T9999", "tactics": ["TA0002"]}
+    service._index_techniques()
+    assert service.map_technique("T9999") == "T9999"
+
+
+def test_map_technique_deprecated():
+    """Test deprecated techniques map to their replacement when it is loaded."""
+    service = make_service({"T1086": {"id": "T1086", "deprecated": True}})
+    assert service.map_technique("T1086") == "T1086"
+
+    service = make_service({
+        "T1086": {"id": "T1086", "deprecated": True},
+        "T1059.001": {"id": "T1059.001", "tactics": ["TA0002"]},
+    })
+    assert service.map_technique("T1086") == "T1059.001"